@@ -0,0 +1,32 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+"""Identity of the node the health checks run on, looked up once per process."""
+
+import functools
+import logging
+import socket
+from typing import Optional, Tuple
+
+
+@functools.lru_cache(maxsize=1)
+def get_hostname() -> str:
+    return socket.gethostname()
+
+
+@functools.lru_cache(maxsize=1)
+def _lookup_gpu_node_id() -> Tuple[Optional[str], Optional[Exception]]:
+    try:
+        # imported here so checks only pay for gni_lib when a GPU node id is needed
+        import gni_lib
+
+        return gni_lib.get_gpu_node_id(), None
+    except Exception as e:
+        return None, e
+
+
+def get_gpu_node_id(logger: logging.Logger) -> Optional[str]:
+    """Return the GPU node id, or None (with a warning) if this is not a GPU host."""
+    gpu_node_id, e = _lookup_gpu_node_id()
+    if e is not None:
+        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    return gpu_node_id
@@ -0,0 +1,21 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+"""Raw reads of `/sys` attributes shared by the device checks."""
+
+import os
+
+# a sysfs attribute is at most one page long
+_SYSFS_ATTR_MAX_BYTES = 4096
+
+
+def read_sysfs_attr(path: str) -> str:
+    """Return the stripped value of a `/sys` attribute, raising OSError on failure.
+
+    A single raw read on the fd gets the whole value, without a buffered text file
+    object.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, _SYSFS_ATTR_MAX_BYTES).decode().strip()
+    finally:
+        os.close(fd)
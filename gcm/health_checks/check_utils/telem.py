@@ -10,6 +10,7 @@ from typing import (
     Collection,
     ContextManager,
     Dict,
+    List,
     Literal,
     Optional,
     Tuple,
@@ -55,6 +56,60 @@ def get_telemetry_record(
     )
 
 
+def write_telemetry_records(
+    sink: str,
+    sink_opts: Collection[str],
+    telem_registry: Dict[str, Factory[SinkImpl]],
+    logger: logging.Logger,
+    records: List[HealthCheckLog],
+) -> None:
+    # Get writer from telemetry
+    sink_impl = telem_registry[sink](**oc.from_dotlist(list(sink_opts)))
+    clock = ClockImpl()
+    log_time = clock.unixtime()
+    try:
+        sink_impl.write(
+            data=Log(
+                ts=log_time,
+                message=records,
+            ),
+            additional_params=SinkAdditionalParams(data_type=DataType.LOG),
+        )
+    except Exception:
+        logger.exception("Telemetry failed with exception.")
+
+
+@dataclass
+class TelemetryBatch(ContextManager["TelemetryBatch"]):
+    """Collects the records of the TelemetryContexts it is passed to and writes
+    them to the sink as a single Log on exit."""
+
+    sink: str
+    sink_opts: Collection[str]
+    logger: logging.Logger
+    telem_registry: Dict[str, Factory[SinkImpl]] = field(
+        default_factory=lambda: registry
+    )
+    records: List[HealthCheckLog] = field(default_factory=list)
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        exc_tb: Optional[types.TracebackType],
+    ) -> Literal[False]:
+        if self.records:
+            write_telemetry_records(
+                sink=self.sink,
+                sink_opts=self.sink_opts,
+                telem_registry=self.telem_registry,
+                logger=self.logger,
+                records=self.records,
+            )
+            self.records = []
+        return False
+
+
 @dataclass
 class TelemetryContext(ContextManager["TelemetryContext"]):
     sink: str
@@ -71,6 +126,7 @@ class TelemetryContext(ContextManager["TelemetryContext"]):
     telem_registry: Dict[str, Factory[SinkImpl]] = field(
         default_factory=lambda: registry
     )
+    batch: Optional[TelemetryBatch] = None
 
     def __enter__(self) -> "TelemetryContext":
         self.start_time = time.time()
@@ -108,20 +164,14 @@ class TelemetryContext(ContextManager["TelemetryContext"]):
             end_time=self.end_time,
             job_id=self.job_id,
         )
-        # Get writer from telemetry
-        sink_impl = self.telem_registry[self.sink](
-            **oc.from_dotlist(list(self.sink_opts))
-        )
-        clock = ClockImpl()
-        log_time = clock.unixtime()
-        try:
-            sink_impl.write(
-                data=Log(
-                    ts=log_time,
-                    message=[record],
-                ),
-                additional_params=SinkAdditionalParams(data_type=DataType.LOG),
+        if self.batch is not None:
+            self.batch.records.append(record)
+        else:
+            write_telemetry_records(
+                sink=self.sink,
+                sink_opts=self.sink_opts,
+                telem_registry=self.telem_registry,
+                logger=self.logger,
+                records=[record],
             )
-        except Exception:
-            self.logger.exception("Telemetry failed with exception.")
         return False
@@ -3,7 +3,6 @@
 import logging
 import os
 import re
-import socket
 import sys
 from contextlib import ExitStack
 from dataclasses import dataclass
@@ -11,7 +10,7 @@ from typing import Collection, Optional, Protocol, Tuple
 
 import click
 
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -130,7 +129,7 @@ def check_dstate(
     process_name: Tuple[str, ...],
 ) -> None:
     """Check to make sure no dstate processes are running on the system."""
-    node: str = socket.gethostname()
+    node: str = get_hostname()
 
     logger, _ = init_logger(
         logger_name=type,
@@ -141,11 +140,7 @@ def check_dstate(
     logger.info(
         f"check-process check-dstate: cluster: {cluster}, node: {node}, type: {type}, process_name: {process_name}"
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -5,16 +5,26 @@ import logging
 import os
 import socket
 import sys
-from contextlib import ExitStack
 from dataclasses import dataclass
 from enum import auto, Enum
-from typing import Any, Collection, Dict, List, NamedTuple, Optional, Protocol, Tuple
+from typing import (
+    AbstractSet,
+    Any,
+    Collection,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+)
 
 import click
 
 import gni_lib
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.output_utils import CheckOutput
+from gcm.health_checks.check_utils.sysfs import read_sysfs_attr
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.checks.check_pci import PciDevice, PciManifest
 from gcm.health_checks.click import common_arguments, telemetry_argument
@@ -25,10 +35,9 @@ from gcm.monitoring.features.gen.generated_features_healthchecksfeatures import
     FeatureValueHealthChecksFeatures,
 )
 from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
-from gcm.monitoring.utils.monitor import init_logger
+from gcm.monitoring.utils.monitor import init_logger_once
 from gcm.schemas.health_check.health_check_name import HealthCheckName
 from pydantic import BaseModel
-from typeguard import typechecked
 
 
 class IBLinkIssue(Enum):
@@ -81,6 +90,11 @@ class IBManifest(BaseModel):
     interfaces: Dict[str, IBInterface]
 
 
+# Parsed manifests keyed by path, stored along with the (st_mtime_ns, st_size) of
+# the file at parse time so that long-lived processes only re-parse on change.
+_manifest_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
 class IBLinkCheck(CheckEnv, Protocol):
     def read_manifest(self, manifest_file: str) -> Dict[str, Any]: ...
 
@@ -95,18 +109,24 @@ class IBLinkCheckImpl:
     log_folder: str
 
     def read_manifest(self, manifest_file: str) -> Dict[str, Any]:
+        st = os.stat(manifest_file)
+        cached = _manifest_cache.get(manifest_file)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
         with open(manifest_file) as manifest:
-            return json.loads(manifest.read())
+            parsed = json.loads(manifest.read())
+        _manifest_cache[manifest_file] = (st.st_mtime_ns, st.st_size, parsed)
+        return parsed
 
     def read_cardstate(self, pci_id: str, pci_info: PciDevice) -> IBLinkState:
         """
         Reads a card's state from /sys or prefix/sys (For testing).
         Since we have 1:1 mapping of HCA pci-ids (including subfunctions) to link interfaces, cardstate maps uniformly to linkstate.
         """
-        sysfs_path = os.path.join("/sys/bus/pci/devices", pci_id)
+        sysfs_path = "/sys/bus/pci/devices/" + pci_id
 
-        mlx5 = _list_sysfs_dir(f"{sysfs_path}/infiniband")
-        ibdev = _list_sysfs_dir(f"{sysfs_path}/net")
+        mlx5 = _list_sysfs_dir(sysfs_path + "/infiniband")
+        ibdev = _list_sysfs_dir(sysfs_path + "/net")
         if mlx5 is None:
             mlx5_str = "UNKNOWN"
         else:
@@ -116,26 +136,20 @@ class IBLinkCheckImpl:
         else:
             ibdev_str = ibdev[0]
 
+        ib_base = sysfs_path + "/infiniband/" + mlx5_str + "/"
+        port_base = ib_base + "ports/1/"
         return IBLinkState(
             slot_id=pci_info.slot,
             pci_id=pci_id,
             ib_id=ibdev_str,
             mlx_id=mlx5_str,
-            desc=_read_sysfs_val(f"{sysfs_path}/infiniband/{mlx5_str}/node_desc"),
-            fw_version=_read_sysfs_val(f"{sysfs_path}/infiniband/{mlx5_str}/fw_ver"),
-            # fmt: off
-            active=_read_sysfs_val(f"{sysfs_path}/infiniband/{mlx5_str}/ports/1/phys_state") == "5: LinkUp",
-            # fmt: on
-            link_state=_read_sysfs_val(
-                f"{sysfs_path}/infiniband/{mlx5_str}/ports/1/state"
-            ),
-            link_type=_read_sysfs_val(
-                f"{sysfs_path}/infiniband/{mlx5_str}/ports/1/link_layer"
-            ),
-            link_rate=_read_sysfs_val(
-                f"{sysfs_path}/infiniband/{mlx5_str}/ports/1/rate"
-            ),
-            operstate=_read_sysfs_val(f"{sysfs_path}/net/{ibdev_str}/operstate")
+            desc=_read_sysfs_val(ib_base + "node_desc"),
+            fw_version=_read_sysfs_val(ib_base + "fw_ver"),
+            active=_read_sysfs_val(port_base + "phys_state") == "5: LinkUp",
+            link_state=_read_sysfs_val(port_base + "state"),
+            link_type=_read_sysfs_val(port_base + "link_layer"),
+            link_rate=_read_sysfs_val(port_base + "rate"),
+            operstate=_read_sysfs_val(sysfs_path + "/net/" + ibdev_str + "/operstate")
             == "up",
         )
 
@@ -143,9 +157,7 @@ class IBLinkCheckImpl:
 # Helper functions to do read-and-return-value-if-fail
 def _read_sysfs_val(path: str) -> Optional[str]:
     try:
-        with open(path, "r") as file:
-            value = file.read().strip()
-            return value
+        return read_sysfs_attr(path)
     except Exception:
         logging.getLogger(__name__).exception("_read_sysfs_val: an exception occurred")
         return None
@@ -160,13 +172,16 @@ def _list_sysfs_dir(path: str) -> Optional[List[str]]:
 
 
 def validate_ib(
-    link_state: IBLinkState, manifest: Dict[str, Any]
+    link_state: IBLinkState,
+    manifest: Dict[str, Any],
+    firmware_versions: AbstractSet[str],
 ) -> List[Tuple[IBLinkIssue, str]]:
     """
     validate_ib takes the link state of a card and returns a list of tuples of error codes + a short string of each issue
     Parameters:
         link_state: The link state as read by read_cardstate
         manifest: The manifest as given by manifest.load, which gives us what the node looks like
+        firmware_versions: The set of accepted firmware versions from the manifest
     Returns:
         List[Tuple[IBLinkIssue, String]], a list of error codes and values
     """
@@ -184,6 +199,15 @@ def validate_ib(
                 f"{dev_slot} is bound to {ibnetdev}, expected {pci_spec.dev}",
             )
         ]
+    # Without a readable mlx5 device none of the remaining attributes mean anything,
+    # so report the card once instead of a cascade of follow-up mismatches
+    if mlxdev == "UNKNOWN" or link_state.fw_version is None:
+        return [
+            (
+                IBLinkIssue.MISBIND,
+                f"{dev_slot}({ibnetdev}) has no readable mlx5 device",
+            )
+        ]
     link_issues: List[Tuple[IBLinkIssue, str]] = []
     ib_manifest = IBManifest(**manifest["ib"])
     ibintf_spec = ib_manifest.interfaces[ibnetdev]
@@ -197,7 +221,7 @@ def validate_ib(
             )
         )
     # Is the firmware at the expected version
-    if link_state.fw_version not in ib_manifest.firmware_version:
+    if link_state.fw_version not in firmware_versions:
         link_issues.append(
             (
                 IBLinkIssue.FIRMWARE_MISMATCH,
@@ -264,21 +288,20 @@ def process_iblink(obj: IBLinkCheck, monitored_devices: Dict[str, Any]) -> Check
         if dev_info.type == "ib":
             cards.append(obj.read_cardstate(pci_dev, dev_info))
 
+    firmware_versions = frozenset(
+        monitored_devices.get("ib", {}).get("firmware_version", [])
+    )
     good_cards = 0
-
-    validation = list(map(lambda x: validate_ib(x, monitored_devices), cards))
-    issue_messages = list(map(lambda x: format_issues(x), validation))
-    for bad_result in validation:
-        if not bad_result:
+    lowest_issue = IBLinkIssue.CRITERION_OK.value
+    issue_messages: List[str] = []
+    for card in cards:
+        card_issues = validate_ib(card, monitored_devices, firmware_versions)
+        if not card_issues:
             good_cards += 1
-
-    flatten_issues = [link_issue for card in validation for link_issue in card]
-
-    lowest_issue = (
-        min(map(lambda x: x[0].value, flatten_issues))
-        if flatten_issues
-        else IBLinkIssue.CRITERION_OK.value
-    )  # Extract the lowest numerical value IBLinkIssue enum from all interface issues for status
+            continue
+        # Keep the lowest numerical value IBLinkIssue enum from all interface issues for status
+        lowest_issue = min(lowest_issue, min(issue.value for issue, _ in card_issues))
+        issue_messages.append(format_issues(card_issues))
 
     check.check_status = ExitCode.CRITICAL
     if lowest_issue > IBLinkIssue.CRITERION_NOT_CRITICAL.value:
@@ -288,9 +311,7 @@ def process_iblink(obj: IBLinkCheck, monitored_devices: Dict[str, Any]) -> Check
 
     check.short_out = f"up: {good_cards}, down: {len(cards) - good_cards}"
 
-    for issue_msg in issue_messages:
-        if issue_msg != "":
-            check.long_out.append(issue_msg)
+    check.long_out.extend(issue_messages)
 
     return check
 
@@ -301,7 +322,6 @@ def process_iblink(obj: IBLinkCheck, monitored_devices: Dict[str, Any]) -> Check
 @heterogeneous_cluster_v1_option
 @click.option("--manifest_file", default="/etc/manifest.json")
 @click.pass_obj
-@typechecked
 def check_iblink(
     obj: Optional[IBLinkCheck],
     cluster: str,
@@ -317,7 +337,7 @@ def check_iblink(
     """Check IB links of the system against the manifest file"""
 
     node: str = socket.gethostname()
-    logger, _ = init_logger(
+    logger, _ = init_logger_once(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
         log_name=node + ".log",
@@ -344,29 +364,26 @@ def check_iblink(
 
     exit_code = ExitCode.UNKNOWN
     msg = ""
-    with ExitStack() as s:
-        s.enter_context(
-            TelemetryContext(
-                sink=sink,
-                sink_opts=sink_opts,
-                logger=logger,
-                cluster=cluster,
-                derived_cluster=derived_cluster,
-                type=type,
-                name=HealthCheckName.CHECK_IBLINK.value,
-                node=node,
-                get_exit_code_msg=lambda: (exit_code, msg),
-                gpu_node_id=gpu_node_id,
-            )
-        )
-        s.enter_context(
-            OutputContext(
-                type,
-                HealthCheckName.CHECK_IBLINK,
-                lambda: (exit_code, msg),
-                verbose_out,
-            )
-        )
+    with (
+        TelemetryContext(
+            sink=sink,
+            sink_opts=sink_opts,
+            logger=logger,
+            cluster=cluster,
+            derived_cluster=derived_cluster,
+            type=type,
+            name=HealthCheckName.CHECK_IBLINK.value,
+            node=node,
+            get_exit_code_msg=lambda: (exit_code, msg),
+            gpu_node_id=gpu_node_id,
+        ),
+        OutputContext(
+            type,
+            HealthCheckName.CHECK_IBLINK,
+            lambda: (exit_code, msg),
+            verbose_out,
+        ),
+    ):
         ff = FeatureValueHealthChecksFeatures()
         if ff.get_healthchecksfeatures_disable_check_iblink():
             exit_code = ExitCode.OK
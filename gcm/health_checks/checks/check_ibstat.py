@@ -5,14 +5,14 @@ import logging
 import os
 import socket
 import sys
-from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import Collection, List, Optional, Protocol, Tuple
+from typing import Collection, List, NamedTuple, Optional, Protocol, Tuple
 
 import click
 
 import gni_lib
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
+from gcm.health_checks.check_utils.sysfs import read_sysfs_attr
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.checks.check_iblink import check_iblink
 from gcm.health_checks.click import (
@@ -22,7 +22,6 @@ from gcm.health_checks.click import (
 )
 from gcm.health_checks.subprocess import (
     handle_subprocess_exception,
-    piped_shell_command,
     PipedShellCommandOut,
     shell_command,
     ShellCommandOut,
@@ -34,10 +33,10 @@ from gcm.monitoring.features.gen.generated_features_healthchecksfeatures import
     FeatureValueHealthChecksFeatures,
 )
 from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
-from gcm.monitoring.utils.monitor import init_logger
+from gcm.monitoring.utils.monitor import init_logger_once
 from gcm.schemas.health_check.health_check_name import HealthCheckName
-from pydantic import BaseModel
-from typeguard import typechecked
+
+IB_SYSFS_CLASS_PATH = "/sys/class/infiniband"
 
 
 @click.group()
@@ -53,7 +52,6 @@ class IBStat(CheckEnv, Protocol):
         self,
         use_physical_state: bool,
         iblinks_only: bool,
-        timeout_secs: int,
         logger: logging.Logger,
     ) -> PipedShellCommandOut: ...
 
@@ -75,27 +73,18 @@ class IBStatImpl:
         self,
         use_physical_state: bool,
         iblinks_only: bool,
-        timeout_secs: int,
         logger: logging.Logger,
     ) -> PipedShellCommandOut:
-        cmd = ["ibstat"]
-        if use_physical_state:
-            if iblinks_only:
-                cmd.append(
-                    'awk \'/Physical state:/ { state = $NF } /Link layer:/ { if ($NF == "InfiniBand") print "Physical state:", state; state = "" }\''
-                )
-            else:
-                cmd.append("grep 'Physical state'")
-        else:
-            if iblinks_only:
-                cmd.append(
-                    'awk \'/State:/ { state = $NF } /Link layer:/ { if ($NF == "InfiniBand") print "State:", state; state = "" }\''
-                )
-            else:
-                cmd.append("grep 'State'")
-
-        logger.info(f"Running command {' | '.join(cmd)}")
-        return piped_shell_command(cmd, timeout_secs)
+        logger.info(f"Reading port states from {IB_SYSFS_CLASS_PATH}")
+        try:
+            port_states = read_ib_port_states(IB_SYSFS_CLASS_PATH)
+        except OSError as e:
+            return PipedShellCommandOut(
+                [1], f"Unable to read {IB_SYSFS_CLASS_PATH}: {e}\n"
+            )
+        return PipedShellCommandOut(
+            [0], format_ib_port_states(port_states, use_physical_state, iblinks_only)
+        )
 
     def get_ib_interfaces(
         self,
@@ -110,29 +99,84 @@ class IBStatImpl:
         )
 
 
+class IBPortState(NamedTuple):
+    state: str
+    phys_state: str
+    link_layer: str
+
+
+# sysfs reports port states as e.g. "4: ACTIVE", ibstat prints them as "Active"
+IBSTAT_STATE_NAMES = {
+    "DOWN": "Down",
+    "INIT": "Initializing",
+    "ARMED": "Armed",
+    "ACTIVE": "Active",
+    "ACTIVE_DEFER": "Active/Defer",
+}
+
+
+def read_ib_port_states(sysfs_path: str) -> List[IBPortState]:
+    """Read the state of every port of every IB device from sysfs, in ibstat order"""
+    port_states: List[IBPortState] = []
+    for device in sorted(os.listdir(sysfs_path)):
+        ports_path = os.path.join(sysfs_path, device, "ports")
+        for port in sorted(os.listdir(ports_path), key=int):
+            port_path = os.path.join(ports_path, port)
+            port_states.append(
+                IBPortState(
+                    state=read_sysfs_attr(os.path.join(port_path, "state")),
+                    phys_state=read_sysfs_attr(os.path.join(port_path, "phys_state")),
+                    link_layer=read_sysfs_attr(os.path.join(port_path, "link_layer")),
+                )
+            )
+    return port_states
+
+
+def format_ib_port_states(
+    port_states: List[IBPortState], use_physical_state: bool, iblinks_only: bool
+) -> str:
+    """Render port states as the 'State:'/'Physical state:' lines printed by ibstat"""
+    lines: List[str] = []
+    for port_state in port_states:
+        if iblinks_only and port_state.link_layer != "InfiniBand":
+            continue
+        if use_physical_state:
+            phys_state = port_state.phys_state.split(": ", 1)[-1]
+            lines.append(f"Physical state: {phys_state}")
+        else:
+            state = port_state.state.split(": ", 1)[-1]
+            lines.append(f"State: {IBSTAT_STATE_NAMES.get(state, state)}")
+    return "\n".join(lines)
+
+
 def process_ibstat_output(
     output: str, error_code: int, use_physical_state: bool
 ) -> Tuple[ExitCode, str]:
     if error_code > 0 or len(output) == 0:
         return (
             ExitCode.WARN,
-            f"ibstat command FAILED to execute. error_code: {error_code} output: {output}\n",
+            f"Reading the port states from {IB_SYSFS_CLASS_PATH} FAILED. error_code: {error_code} output: {output}\n",
         )
 
-    for line in output.splitlines():
-        if use_physical_state:
-            if "LinkUp" not in line:
-                return ExitCode.CRITICAL, "Link status is not LinkUp"
-        else:
-            if "Active" not in line:
-                return ExitCode.CRITICAL, "Link state is not Active"
+    if use_physical_state:
+        marker, failure_msg = "LinkUp", "Link status is not LinkUp"
+    else:
+        marker, failure_msg = "Active", "Link state is not Active"
+    if any(marker not in line for line in output.splitlines()):
+        return ExitCode.CRITICAL, failure_msg
 
     return ExitCode.OK, "ib stat reported ok status"
 
 
 @check_ib.command()
 @common_arguments
-@timeout_argument
+@click.option(
+    "--timeout",
+    type=click.INT,
+    default=300,
+    help="Deprecated and ignored: the port states are read from sysfs, "
+    "which doesn't run a command that could time out.",
+)
 @telemetry_argument
 @heterogeneous_cluster_v1_option
 @click.option(
@@ -148,7 +192,6 @@ def process_ibstat_output(
     show_default=True,
 )
 @click.pass_obj
-@typechecked
 def check_ibstat(
     obj: Optional[IBStat],
     cluster: str,
@@ -166,7 +209,7 @@ def check_ibstat(
     """Check ibstat for the link status"""
 
     node: str = socket.gethostname()
-    logger, _ = init_logger(
+    logger, _ = init_logger_once(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
         log_name=node + ".log",
@@ -192,29 +235,26 @@ def check_ibstat(
     exit_code = ExitCode.UNKNOWN
     msg = ""
 
-    with ExitStack() as s:
-        s.enter_context(
-            TelemetryContext(
-                sink=sink,
-                sink_opts=sink_opts,
-                logger=logger,
-                cluster=cluster,
-                derived_cluster=derived_cluster,
-                type=type,
-                name=HealthCheckName.CHECK_IBSTAT.value,
-                node=node,
-                get_exit_code_msg=lambda: (exit_code, msg),
-                gpu_node_id=gpu_node_id,
-            )
-        )
-        s.enter_context(
-            OutputContext(
-                type,
-                HealthCheckName.CHECK_IBSTAT,
-                lambda: (exit_code, msg),
-                verbose_out,
-            )
-        )
+    with (
+        TelemetryContext(
+            sink=sink,
+            sink_opts=sink_opts,
+            logger=logger,
+            cluster=cluster,
+            derived_cluster=derived_cluster,
+            type=type,
+            name=HealthCheckName.CHECK_IBSTAT.value,
+            node=node,
+            get_exit_code_msg=lambda: (exit_code, msg),
+            gpu_node_id=gpu_node_id,
+        ),
+        OutputContext(
+            type,
+            HealthCheckName.CHECK_IBSTAT,
+            lambda: (exit_code, msg),
+            verbose_out,
+        ),
+    ):
         ff = FeatureValueHealthChecksFeatures()
         if ff.get_healthchecksfeatures_disable_check_ibstat():
             exit_code = ExitCode.OK
@@ -223,7 +263,7 @@ def check_ibstat(
             sys.exit(exit_code.value)
         try:
             ibstat_output: PipedShellCommandOut = obj.get_ibstat(
-                physical_state, iblinks_only, timeout, logger
+                physical_state, iblinks_only, logger
             )
         except Exception as e:
             exc_out = handle_subprocess_exception(e)
@@ -238,22 +278,6 @@ def check_ibstat(
         sys.exit(exit_code.value)
 
 
-class NetworkInterface(BaseModel):
-    ifindex: int
-    ifname: str
-    flags: List[str]
-    mtu: int
-    qdisc: str
-    operstate: str
-    linkmode: str
-    group: str
-    txqlen: Optional[int]
-    link_type: str
-    address: str
-    broadcast: str
-    vfinfo_list: Optional[List[str]]
-
-
 def process_ib_interfaces_output(
     output: str, error_code: int, expected_interfaces: int
 ) -> Tuple[ExitCode, str]:
@@ -269,11 +293,12 @@ def process_ib_interfaces_output(
     except ValueError:
         return ExitCode.CRITICAL, f"Invalid output returned: {output}"
 
-    network_interfaces = [NetworkInterface(**item) for item in present_interfaces]
-    ib_interfaces = 0
-    for interface in network_interfaces:
-        if interface.link_type == "infiniband" and interface.operstate == "UP":
-            ib_interfaces += 1
+    ib_interfaces = sum(
+        1
+        for interface in present_interfaces
+        if interface.get("link_type") == "infiniband"
+        and interface.get("operstate") == "UP"
+    )
 
     if ib_interfaces != expected_interfaces:
         msg = f"Number of interfaces present, {ib_interfaces}, is different than expected, {expected_interfaces}\n"
@@ -290,7 +315,6 @@ def process_ib_interfaces_output(
 @heterogeneous_cluster_v1_option
 @click.option("--interface-num", type=click.INT, default=8)
 @click.pass_obj
-@typechecked
 def check_ib_interfaces(
     obj: Optional[IBStat],
     cluster: str,
@@ -307,7 +331,7 @@ def check_ib_interfaces(
     """Check ib-interfaces for the link status"""
 
     node: str = socket.gethostname()
-    logger, _ = init_logger(
+    logger, _ = init_logger_once(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
         log_name=node + ".log",
@@ -335,29 +359,26 @@ def check_ib_interfaces(
     exit_code = ExitCode.UNKNOWN
     msg = ""
 
-    with ExitStack() as s:
-        s.enter_context(
-            TelemetryContext(
-                sink=sink,
-                sink_opts=sink_opts,
-                logger=logger,
-                cluster=cluster,
-                derived_cluster=derived_cluster,
-                type=type,
-                name=HealthCheckName.CHECK_IB_INTERFACES.value,
-                node=node,
-                get_exit_code_msg=lambda: (exit_code, msg),
-                gpu_node_id=gpu_node_id,
-            )
-        )
-        s.enter_context(
-            OutputContext(
-                type,
-                HealthCheckName.CHECK_IB_INTERFACES,
-                lambda: (exit_code, msg),
-                verbose_out,
-            )
-        )
+    with (
+        TelemetryContext(
+            sink=sink,
+            sink_opts=sink_opts,
+            logger=logger,
+            cluster=cluster,
+            derived_cluster=derived_cluster,
+            type=type,
+            name=HealthCheckName.CHECK_IB_INTERFACES.value,
+            node=node,
+            get_exit_code_msg=lambda: (exit_code, msg),
+            gpu_node_id=gpu_node_id,
+        ),
+        OutputContext(
+            type,
+            HealthCheckName.CHECK_IB_INTERFACES,
+            lambda: (exit_code, msg),
+            verbose_out,
+        ),
+    ):
         ff = FeatureValueHealthChecksFeatures()
         if ff.get_healthchecksfeatures_disable_check_ib_interfaces():
             exit_code = ExitCode.OK
@@ -3,15 +3,13 @@
 import logging
 import os
 import re
-import socket
 import sys
-from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import Collection, Optional, Protocol, Tuple
+from typing import Collection, Iterable, Iterator, List, Optional, Protocol, Tuple
 
 import click
 
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -33,7 +31,21 @@ from gcm.monitoring.features.gen.generated_features_healthchecksfeatures import
 from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
 from gcm.monitoring.utils.monitor import init_logger
 from gcm.schemas.health_check.health_check_name import HealthCheckName
-from typeguard import typechecked
+
+# A single alternation so each SEL line is scanned once for all known errors
+_SEL_ERROR_RE = re.compile(
+    "|".join(
+        (
+            r"Power Supply.*AC lost",
+            r"NVIDIA_MCA_Error",
+            r"Uncorrectable error",
+            r"Critical Interrupt.*Bus Fatal Error",
+            r"Critical Interrupt.*PCI SERR",
+            r"Processor.*Throttled",
+            r"System Firmwares.*BIOS corruption detected",
+        )
+    )
+)
 
 
 @click.group()
@@ -51,7 +63,7 @@ class IpmitoolCheck(CheckEnv, Protocol):
     ) -> ShellCommandOut: ...
 
     def clear_sel(
-        self, timeout_secs: int, output: str, clear_log_threshold: int
+        self, timeout_secs: int, line_count: int, clear_log_threshold: int
     ) -> None: ...
 
 
@@ -70,23 +82,69 @@ class IpmitoolCheckImpl:
         logger: logging.Logger,
     ) -> ShellCommandOut:
         """Invoke ipmitool/nvipmitool sel command to get the System Event Logs"""
-        cmd = ""
-        if use_sudo:
-            cmd += "sudo "
+        cmd: List[str] = []
         if use_ipmitool:
-            cmd += "ipmitool sel list"
+            if use_sudo:
+                cmd.append("sudo")
+            cmd.append("ipmitool")
         else:
-            cmd = "nvipmitool sel list"
-        logger.info(f"Running command '{cmd}'")
+            cmd.append("nvipmitool")
+        cmd += ["sel", "list"]
+        logger.info(f"Running command '{' '.join(cmd)}'")
         return shell_command(cmd, timeout_secs)
 
     def clear_sel(
-        self, timeout_secs: int, output: str, clear_log_threshold: int
+        self, timeout_secs: int, line_count: int, clear_log_threshold: int
     ) -> None:
-        lines = output.splitlines()
-        if len(lines) > clear_log_threshold:
+        if line_count > clear_log_threshold:
             # We can always use the ipmitool for clearing. It is used like that across all cluster.
-            shell_command("ipmitool sel clear", timeout_secs)
+            shell_command(["ipmitool", "sel", "clear"], timeout_secs)
+
+
+def count_lines(output: str) -> int:
+    """Same count as len(output.splitlines()), without building the list of lines"""
+    line_count = output.count("\n")
+    if output and not output.endswith("\n"):
+        line_count += 1
+    return line_count
+
+
+def _asserted_lines(output: str) -> Iterator[str]:
+    """Yield only the lines of output that contain 'Asserted', one at a time."""
+    pos = output.find("Asserted")
+    while pos != -1:
+        start = output.rfind("\n", 0, pos) + 1
+        end = output.find("\n", pos)
+        if end == -1:
+            end = len(output)
+        yield output[start:end]
+        pos = output.find("Asserted", end)
+
+
+def process_sel_lines(lines: Iterable[str]) -> Tuple[ExitCode, str]:
+    """Scan SEL lines as they are produced, keeping only the detected errors."""
+    errors: List[str] = []
+    for line in lines:
+        if "Asserted" in line and _SEL_ERROR_RE.search(line) is not None:
+            # split into: line number, date, time, message, status, assertion status
+            msg_alerts = line.split("|")
+            if len(msg_alerts) >= 5:
+                # append the pieces so the final join is the only concatenation
+                errors.extend(
+                    (
+                        "Detected error: ",
+                        msg_alerts[3].strip(),
+                        ", ",
+                        msg_alerts[4].strip(),
+                    )
+                )
+            else:
+                errors.append(f"Invalid output detected: {line}")
+
+    if not errors:
+        return ExitCode.OK, "sel reported no errors."
+
+    return ExitCode.CRITICAL, "".join(errors)
 
 
 def process_sel_out(
@@ -99,36 +157,7 @@ def process_sel_out(
             f"ipmitool sel command FAILED to execute. error_code: {error_code} output: {output}\n",
         )
 
-    sel_errors = [
-        re.compile(r"(.*)Power Supply(.*)AC lost(.*)$"),
-        re.compile(r"(.*)NVIDIA_MCA_Error(.*)$"),
-        re.compile(r"(.*)Uncorrectable error(.*)$"),
-        re.compile(r"(.*)Critical Interrupt(.*)Bus Fatal Error(.*)$"),
-        re.compile(r"(.*)Critical Interrupt(.*)PCI SERR(.*)$"),
-        re.compile(r"(.*)Processor(.*)Throttled(.*)$"),
-        re.compile(r"(.*)System Firmwares(.*)BIOS corruption detected(.*)$"),
-    ]
-    exit_code = ExitCode.OK
-    msg = ""
-    lines = output.splitlines()
-    for line in lines:
-        if "Asserted" not in line:
-            continue
-        for error in sel_errors:
-            if re.match(error, line) is not None:
-                exit_code = ExitCode.CRITICAL
-                try:
-                    # split into: line number, date, time, message, status, assertion status
-                    msg_alerts = line.split("|")
-                    alerts = msg_alerts[3].strip() + ", " + msg_alerts[4].strip()
-                    msg += f"Detected error: {alerts}"
-                except Exception:
-                    msg += f"Invalid output detected: {line}"
-
-    if exit_code == ExitCode.OK:
-        msg = "sel reported no errors."
-
-    return exit_code, msg
+    return process_sel_lines(_asserted_lines(output))
 
 
 @check_ipmitool.command()
@@ -155,7 +184,6 @@ def process_sel_out(
     show_default=True,
 )
 @click.pass_obj
-@typechecked
 def check_sel(
     obj: Optional[IpmitoolCheck],
     cluster: str,
@@ -173,7 +201,7 @@ def check_sel(
 ) -> None:
     """Check the System Event Log (SEL) with ipmitool/nvipmitool"""
 
-    node: str = socket.gethostname()
+    node: str = get_hostname()
     logger, _ = init_logger(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
@@ -183,11 +211,7 @@ def check_sel(
     logger.info(
         f"check-ipmitool check-sel: cluster: {cluster}, node: {node}, type: {type}, log_refresh_threshold: {clear_log_threshold}, use ipmitool: {ipmitool}."
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -200,26 +224,23 @@ def check_sel(
 
     exit_code = ExitCode.UNKNOWN
     msg = ""
-    with ExitStack() as s:
-        s.enter_context(
-            TelemetryContext(
-                sink=sink,
-                sink_opts=sink_opts,
-                logger=logger,
-                cluster=cluster,
-                derived_cluster=derived_cluster,
-                type=type,
-                name=HealthCheckName.IPMI_SEL.value,
-                node=node,
-                get_exit_code_msg=lambda: (exit_code, msg),
-                gpu_node_id=gpu_node_id,
-            )
-        )
-        s.enter_context(
-            OutputContext(
-                type, HealthCheckName.IPMI_SEL, lambda: (exit_code, msg), verbose_out
-            )
-        )
+    with (
+        TelemetryContext(
+            sink=sink,
+            sink_opts=sink_opts,
+            logger=logger,
+            cluster=cluster,
+            derived_cluster=derived_cluster,
+            type=type,
+            name=HealthCheckName.IPMI_SEL.value,
+            node=node,
+            get_exit_code_msg=lambda: (exit_code, msg),
+            gpu_node_id=gpu_node_id,
+        ),
+        OutputContext(
+            type, HealthCheckName.IPMI_SEL, lambda: (exit_code, msg), verbose_out
+        ),
+    ):
         ff = FeatureValueHealthChecksFeatures()
         if ff.get_healthchecksfeatures_disable_ipmi_sel():
             exit_code = ExitCode.OK
@@ -234,7 +255,7 @@ def check_sel(
         exit_code, msg = process_sel_out(sel_out.stdout, sel_out.returncode)
 
         try:
-            obj.clear_sel(timeout, sel_out.stdout, clear_log_threshold)
+            obj.clear_sel(timeout, count_lines(sel_out.stdout), clear_log_threshold)
         except Exception as e:
             msg += f"Clearing sel failed, exception: {e}"
             if ExitCode.WARN > exit_code:
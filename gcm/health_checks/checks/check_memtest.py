@@ -3,16 +3,13 @@
 import logging
 import os
 import pathlib
-import socket
 import sys
-from concurrent.futures import as_completed, ThreadPoolExecutor
-from contextlib import ExitStack
-from shlex import join
+import threading
 from typing import Callable, Collection, Dict, List, Literal, Optional, Tuple
 
 import click
 
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -35,7 +32,6 @@ from gcm.monitoring.features.gen.generated_features_healthchecksfeatures import
 from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
 from gcm.monitoring.utils.monitor import init_logger
 from gcm.schemas.health_check.health_check_name import HealthCheckName
-from typeguard import typechecked
 
 FnCudaMemTest = Callable[
     [Optional[str], int, int, int, logging.Logger], ShellCommandOut
@@ -56,14 +52,11 @@ def default_cuda_memtest(
     else:
         cmd_bin = ["cudaMemTest"]
 
-    cmd = join(
-        cmd_bin
-        + [
-            f"--device={device_id}",
-            f"--alloc_mem_gb={alloc_size_gb}",
-        ]
-    )
-    logger.info(f"Running command '{cmd}'")
+    cmd = cmd_bin + [
+        f"--device={device_id}",
+        f"--alloc_mem_gb={alloc_size_gb}",
+    ]
+    logger.info(f"Running command '{' '.join(cmd)}'")
     result = shell_command(cmd, timeout)
     return result
 
@@ -76,28 +69,37 @@ def run_cuda_memtests_concurrently(
     logger: logging.Logger,
     cuda_memtest: FnCudaMemTest = default_cuda_memtest,
 ) -> Dict[int, Tuple[ShellCommandOut, ExitCode]]:
-    results = {}
-    with ThreadPoolExecutor() as executor:
-        logger.debug(f"Running cuda memory test in parallel on devices: {device_ids}")
-        future_to_device = {
-            executor.submit(
-                cuda_memtest, bin_path, device_id, alloc_size_gb, timeout, logger
-            ): device_id
-            for device_id in device_ids
-        }
-
-        for future in as_completed(future_to_device):
-            device_id = future_to_device[future]
-            try:
-                result = future.result()
-                logger.debug(f"Device {device_id}: {result}")
-                exit_code = ExitCode.OK if result.returncode == 0 else ExitCode.CRITICAL
-                results[device_id] = (result, exit_code)
-            except Exception as e:
-                result = handle_subprocess_exception(e)
-                logger.error(f"Device {device_id} generated an exception: {e}")
-                result.returncode = ExitCode.WARN.value
-                results[device_id] = (result, ExitCode.WARN)
+    def run_device(device_id: int) -> Tuple[ShellCommandOut, ExitCode]:
+        # Failures are turned into results inside the worker, so no exception has
+        # to be captured by the future and re-raised on the collecting thread
+        try:
+            result = cuda_memtest(bin_path, device_id, alloc_size_gb, timeout, logger)
+        except Exception as e:
+            result = handle_subprocess_exception(e)
+            logger.error(f"Device {device_id} generated an exception: {e}")
+            result.returncode = ExitCode.WARN.value
+            return result, ExitCode.WARN
+        logger.debug(f"Device {device_id}: {result}")
+        return result, ExitCode.OK if result.returncode == 0 else ExitCode.CRITICAL
+
+    results: Dict[int, Tuple[ShellCommandOut, ExitCode]] = {}
+
+    def run_into_results(device_id: int) -> None:
+        results[device_id] = run_device(device_id)
+
+    # Each thread only waits on its own cudaMemTest process, so plain threads are
+    # enough and the executor's work queue and futures are not needed. The GIL is
+    # released while waiting, and cuda_memtest may be any callable (tests inject
+    # fakes), so it can't be replaced by Popen handles or a process pool.
+    logger.debug(f"Running cuda memory test in parallel on devices: {device_ids}")
+    threads = [
+        threading.Thread(target=run_into_results, args=(device_id,))
+        for device_id in device_ids
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
     return results
 
@@ -128,7 +130,6 @@ def run_cuda_memtests_concurrently(
     """,
 )
 @click.pass_obj
-@typechecked
 def memtest(
     obj: Optional[FnCudaMemTest],
     cluster: str,
@@ -145,7 +146,7 @@ def memtest(
     gpu_devices: Collection[int],
 ) -> None:
     """Check to make sure a memory block of specified size can be allocated."""
-    node: str = socket.gethostname()
+    node: str = get_hostname()
 
     logger, _ = init_logger(
         logger_name=type,
@@ -154,11 +155,7 @@ def memtest(
         log_level=getattr(logging, log_level),
     )
     logger.info(f"cuda check_memtest: cluster: {cluster}, node: {node}, type: {type}")
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -167,32 +164,28 @@ def memtest(
     )
 
     run_memtest: FnCudaMemTest = default_cuda_memtest if obj is None else obj
-    exit_codes = []
     overall_exit_code = ExitCode.UNKNOWN
     overall_msg = ""
-    with ExitStack() as s:
-        s.enter_context(
-            TelemetryContext(
-                sink=sink,
-                sink_opts=sink_opts,
-                logger=logger,
-                cluster=cluster,
-                derived_cluster=derived_cluster,
-                type=type,
-                name=HealthCheckName.CUDA_MEMTEST.value,
-                node=node,
-                get_exit_code_msg=lambda: (overall_exit_code, overall_msg),
-                gpu_node_id=gpu_node_id,
-            )
-        )
-        s.enter_context(
-            OutputContext(
-                type,
-                HealthCheckName.CUDA_MEMTEST,
-                lambda: (overall_exit_code, overall_msg),
-                verbose_out,
-            )
-        )
+    with (
+        TelemetryContext(
+            sink=sink,
+            sink_opts=sink_opts,
+            logger=logger,
+            cluster=cluster,
+            derived_cluster=derived_cluster,
+            type=type,
+            name=HealthCheckName.CUDA_MEMTEST.value,
+            node=node,
+            get_exit_code_msg=lambda: (overall_exit_code, overall_msg),
+            gpu_node_id=gpu_node_id,
+        ),
+        OutputContext(
+            type,
+            HealthCheckName.CUDA_MEMTEST,
+            lambda: (overall_exit_code, overall_msg),
+            verbose_out,
+        ),
+    ):
         ff = FeatureValueHealthChecksFeatures()
         if ff.get_healthchecksfeatures_disable_cuda_memtest():
             overall_exit_code = ExitCode.OK
@@ -242,9 +235,10 @@ def memtest(
                     device_msg += f"deviceID: {device_id} passed "
 
                 device_messages.append(device_msg)
-                exit_codes.append(exit_code)
+                # UNKNOWN orders below every other code, so the first result replaces it
+                if exit_code > overall_exit_code:
+                    overall_exit_code = exit_code
 
-        overall_exit_code = max(exit_codes or [overall_exit_code])
         if overall_exit_code == ExitCode.UNKNOWN:
             overall_msg += "\nCUDA memory test failed to execute"
 
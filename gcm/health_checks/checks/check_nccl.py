@@ -5,8 +5,9 @@ import logging
 
 import os
 import re
-import socket
+import shlex
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
 from dataclasses import dataclass
 from typing import (
@@ -23,7 +24,7 @@ from typing import (
 
 import click
 
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -33,7 +34,7 @@ from gcm.health_checks.click import (
 )
 from gcm.health_checks.subprocess import (
     handle_subprocess_exception,
-    shell_command,
+    shell_command_tail,
     ShellCommandOut,
 )
 from gcm.health_checks.types import CHECK_TYPE, ExitCode, LOG_LEVEL
@@ -47,11 +48,14 @@ from gcm.monitoring.slurm.nodelist_parsers import nodelist
 from gcm.monitoring.utils.monitor import init_logger
 from gcm.schemas.health_check.health_check_name import HealthCheckName
 
-FnShellCommand = Callable[[str, int], ShellCommandOut]
+FnShellCommand = Callable[[List[str], int], ShellCommandOut]
 
 Flavor = Literal["single", "pairwise", "pairwise-quick"]
 NCCL_OPERATION = Literal["all_gather", "all_reduce", "alltoall"]
 
+_AVG_BUS_BW_MARKER = "Avg bus bandwidth"
+_AVG_BUS_BW_RE = re.compile(_AVG_BUS_BW_MARKER + r"[^\n]*?([-+]?\d*\.*\d+)")
+
 
 class PairwiseRequiredOption(click.Option):
     def process_value(self, ctx: click.Context, value: Any) -> Any:
@@ -64,7 +68,7 @@ class PairwiseRequiredOption(click.Option):
         return value
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NCCLTestProcessedOutput:
     message: str
     exitcode: ExitCode
@@ -80,20 +84,20 @@ def get_hosts(
 ) -> List[Tuple[str, ...]]:
     hosts: List[Tuple[str, ...]]
 
-    hostnames = [socket.gethostname()]
+    hostnames = [get_hostname()]
 
     if hostlist is not None:
         hostlist_parser = nodelist()
         parsed, unparsed = hostlist_parser(hostlist)
 
         if parsed is None:
-            logger.info(f'Invalid hostlist: "{unparsed}"')
+            logger.info('Invalid hostlist: "%s"', unparsed)
             raise click.BadParameter(
                 message=f'Invalid hostlist: "{unparsed}"',
                 param_hint="--hostlist",
             )
 
-        logger.info(f'Parsed hostlist: "{parsed}"')
+        logger.info('Parsed hostlist: "%s"', parsed)
         hostnames = parsed
 
     if flavor == "single":
@@ -109,9 +113,14 @@ def get_hosts(
         return list(itertools.combinations(hostnames, 2))
 
     if flavor == "pairwise-quick":
-        hosts = list(zip(hostnames[::2], hostnames[1::2]))
+        hosts = list(
+            zip(
+                itertools.islice(hostnames, 0, None, 2),
+                itertools.islice(hostnames, 1, None, 2),
+            )
+        )
         if len(hostnames) % 2:
-            hosts += [(hostnames[-1], hostnames[0])]
+            hosts.append((hostnames[-1], hostnames[0]))
         return hosts
 
     def assert_never(value: NoReturn) -> NoReturn:
@@ -121,16 +130,30 @@ def get_hosts(
 
 
 def get_avg_bus_bw(output: ShellCommandOut) -> Optional[float]:
-    if output.returncode > 0 or "Avg bus bandwidth" not in output.stdout:
+    if output.returncode > 0:
         return None
 
-    for line in output.stdout.split("\n"):
-        if "Avg bus bandwidth" in line:
-            match = re.search(r"[-+]?(\d*\.*\d+)", line)
-            avg_bus_bw = float(match.group()) if match else 0.0
-            return avg_bus_bw
+    match = _AVG_BUS_BW_RE.search(output.stdout)
+    if match is not None:
+        return float(match.group(1))
+
+    # a bandwidth line without a value still counts as a (zero) reading
+    return 0.0 if _AVG_BUS_BW_MARKER in output.stdout else None
+
 
-    return None
+def split_opts(opts: str) -> List[str]:
+    """Split an option string into arguments, expanding `$VAR` and `~` in each.
+
+    mpirun is run without a shell, so this keeps the environment variable and home
+    directory expansion the options used to get from /bin/sh. Glob patterns are not
+    expanded.
+    """
+    return [os.path.expanduser(os.path.expandvars(arg)) for arg in shlex.split(opts)]
+
+
+def run_nccl_test(cmd: List[str], timeout: int) -> ShellCommandOut:
+    # keep the bandwidth summary even if teardown output pushes it out of the tail
+    return shell_command_tail(cmd, timeout, keep_line_with=_AVG_BUS_BW_MARKER)
 
 
 def process_nccl_test_ouput(
@@ -139,41 +162,28 @@ def process_nccl_test_ouput(
     critical_threshold: float,
     warn_threshold: Optional[float],
 ) -> NCCLTestProcessedOutput:
-    processed_output = NCCLTestProcessedOutput(
-        f"NCCL Test - {op} - FAILED to run.",
-        ExitCode.CRITICAL,
-        output.stdout,
-        output.returncode,
-    )
-    if output.returncode > 0:
-        processed_output.exitcode = ExitCode.WARN
-        return processed_output
-
-    avg_bus_bw = get_avg_bus_bw(output)
+    avg_bus_bw = None if output.returncode > 0 else get_avg_bus_bw(output)
 
     if avg_bus_bw is None:
-        processed_output.exitcode = ExitCode.WARN
-        return processed_output
-
-    if avg_bus_bw < critical_threshold:
-        processed_output.message = (
+        message = f"NCCL Test - {op} - FAILED to run."
+        exitcode = ExitCode.WARN
+    elif avg_bus_bw < critical_threshold:
+        message = (
             f"NCCL Test - {op} - ran successfully. "
             "But bus bandwidth value lower than critical threshold."
         )
-        processed_output.exitcode = ExitCode.CRITICAL
-        return processed_output
-
-    if warn_threshold is not None and avg_bus_bw < warn_threshold:
-        processed_output.message = (
+        exitcode = ExitCode.CRITICAL
+    elif warn_threshold is not None and avg_bus_bw < warn_threshold:
+        message = (
             f"NCCL Test - {op} - ran successfully. "
             "But bus bandwidth value lower than warning threshold."
         )
-        processed_output.exitcode = ExitCode.WARN
-        return processed_output
+        exitcode = ExitCode.WARN
+    else:
+        message = f"NCCL Test - {op} - ran successfully"
+        exitcode = ExitCode.OK
 
-    processed_output.message = f"NCCL Test - {op} - ran successfully"
-    processed_output.exitcode = ExitCode.OK
-    return processed_output
+    return NCCLTestProcessedOutput(message, exitcode, output.stdout, output.returncode)
 
 
 @click.command()
@@ -249,7 +259,10 @@ def process_nccl_test_ouput(
     type=str,
     help="Options to pass to the underlying mpirun command. "
     "Default includes: -mca coll_hcoll_enable 0 --bind-to numa"
-    "See https://www.open-mpi.org/doc/current/man1/mpirun.1.php",
+    "See https://www.open-mpi.org/doc/current/man1/mpirun.1.php. "
+    "mpirun is not run through a shell: the options are split with shell "
+    "quoting rules and $VAR and ~ are expanded, but glob patterns and other "
+    "shell syntax are not.",
     default="-mca coll_hcoll_enable 0 --bind-to numa",
     show_default=True,
 )
@@ -260,7 +273,8 @@ def process_nccl_test_ouput(
     type=str,
     multiple=True,
     help="Export the specified environment variables before executing the program. "
-    "Only one environment variable can be specified per -x option.",
+    "Only one environment variable can be specified per -x option. "
+    "$VAR in the value is expanded.",
     default=[
         "NCCL_IB_PCI_RELAXED_ORDERING=1",
         "CUDA_DEVICE_ORDER=PCI_BUS_ID",
@@ -278,7 +292,8 @@ def process_nccl_test_ouput(
 @click.option(
     "--nccl-topts",
     type=str,
-    help="NCCL test options. See https://github.com/NVIDIA/nccl-tests#arguments",
+    help="NCCL test options. See https://github.com/NVIDIA/nccl-tests#arguments. "
+    "Expanded like --mpi-opts.",
     default="-g 1 -b 32M -e 1G -f 2",
     show_default=True,
 )
@@ -303,6 +318,12 @@ def process_nccl_test_ouput(
     type=float,
     help="Command exits with a warning exit code if avg bus bw value (in GB/s) is below this threshold",
 )
+@click.option(
+    "--fail-fast/--no-fail-fast",
+    default=False,
+    help="Stop running further NCCL tests after the first one with a critical result.",
+    show_default=True,
+)
 @click.pass_obj
 def check_nccl(
     obj: Optional[FnShellCommand],
@@ -328,12 +349,13 @@ def check_nccl(
     operations: Tuple[NCCL_OPERATION],
     critical_threshold: float,
     warn_threshold: Optional[float],
+    fail_fast: bool,
 ) -> None:
     """
     Run NCCL tests to check both the performance and the correctness of NCCL operations.
     """
 
-    node: str = socket.gethostname()
+    node: str = get_hostname()
 
     logger, _ = init_logger(
         logger_name=type,
@@ -342,12 +364,8 @@ def check_nccl(
         log_level=getattr(logging, log_level),
     )
 
-    logger.info(f"check_nccl: cluster: {cluster}, node: {node}, type: {type}")
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    logger.info("check_nccl: cluster: %s, node: %s, type: %s", cluster, node, type)
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -371,21 +389,19 @@ def check_nccl(
         ),
     ]
 
-    mpi_opts = mpi_opts.strip()
-    if mpi_opts:
-        cmd_args += [mpi_opts]
+    cmd_args.extend(split_opts(mpi_opts))
 
     if exports:
         for export in exports:
-            cmd_args += ["-x", export]
+            cmd_args.extend(("-x", os.path.expandvars(export)))
 
     if not nvlink:
-        cmd_args += ["-x", "NCCL_P2P_DISABLE=1"]
-        cmd_args += ["-x", "NCCL_SHM_DISABLE=1"]
+        cmd_args.extend(("-x", "NCCL_P2P_DISABLE=1"))
+        cmd_args.extend(("-x", "NCCL_SHM_DISABLE=1"))
 
     runner = obj
     if runner is None:
-        runner = shell_command
+        runner = run_nccl_test
 
     outputs: List[NCCLTestProcessedOutput] = []
     exit_code = ExitCode.UNKNOWN
@@ -416,37 +432,67 @@ def check_nccl(
             msg = f"{HealthCheckName.NCCL_TESTS.value} is disabled by killswitch."
             logger.info(msg)
             sys.exit(exit_code.value)
-        for host in hosts:
-            for op in operations:
-                op_bin = nccl_tdir.rstrip("/") + "/" + op + "_perf"
-                host_arg = [
-                    "--host",
-                    ",".join([f"{hostname}:{gpus_per_node}" for hostname in host]),
-                ]
-                cmd = mpirun_cmd + host_arg + cmd_args + [op_bin, nccl_topts]
-                cmd_str = " ".join(cmd)
-
-                logger.info(f"Running command '{cmd_str}'")
+
+        nccl_tdir_prefix = nccl_tdir.rstrip("/") + "/"
+        nccl_topts_args = split_opts(nccl_topts)
+        op_args = [
+            [nccl_tdir_prefix + op + "_perf"] + nccl_topts_args for op in operations
+        ]
+
+        gpus_per_node_suffix = f":{gpus_per_node}"
+
+        def run_host(host: Tuple[str, ...]) -> List[NCCLTestProcessedOutput]:
+            host_cmd = mpirun_cmd + [
+                "--host",
+                ",".join([hostname + gpus_per_node_suffix for hostname in host]),
+            ]
+            host_cmd += cmd_args
+            host_outputs: List[NCCLTestProcessedOutput] = []
+            for op, args in zip(operations, op_args):
+                cmd = host_cmd + args
+                cmd_str = shlex.join(cmd)
+
+                logger.info("Running command '%s'", cmd_str)
                 try:
-                    output: ShellCommandOut = runner(cmd_str, timeout)
+                    output: ShellCommandOut = runner(cmd, timeout)
                 except Exception as e:
                     output = handle_subprocess_exception(e)
-
-                processed_output: NCCLTestProcessedOutput = process_nccl_test_ouput(
+                processed_output = process_nccl_test_ouput(
                     output, op, critical_threshold, warn_threshold
                 )
-                msg = f"Exit Code {processed_output.exitcode.value}: {processed_output.message}"
-                logger.info(msg)
-                logger.info(f"Output:\n{processed_output.stdout}")
-                print(processed_output.stdout)
-
-                outputs += [processed_output]
-
-        if any(output.exitcode == ExitCode.CRITICAL for output in outputs):
-            exit_code = ExitCode.CRITICAL
-        elif any(output.exitcode == ExitCode.WARN for output in outputs):
-            exit_code = ExitCode.WARN
-        else:
-            exit_code = ExitCode.OK
+                host_outputs.append(processed_output)
+                if fail_fast and processed_output.exitcode == ExitCode.CRITICAL:
+                    break
+            return host_outputs
+
+        # Single node tests on different hosts share no GPUs, so they are run
+        # concurrently. Pairwise runs share hosts and stay sequential so that they
+        # don't skew each other's bus bandwidth.
+        executor = (
+            ThreadPoolExecutor(max_workers=min(32, len(hosts)))
+            if flavor == "single" and len(hosts) > 1
+            else None
+        )
+        outputs_per_host = (
+            map(run_host, hosts) if executor is None else executor.map(run_host, hosts)
+        )
+        try:
+            for host_outputs in outputs_per_host:
+                for processed_output in host_outputs:
+                    msg = f"Exit Code {processed_output.exitcode.value}: {processed_output.message}"
+                    logger.info(msg)
+                    logger.info("Output:\n%s", processed_output.stdout)
+                    print(processed_output.stdout)
+
+                    outputs.append(processed_output)
+
+                if fail_fast and outputs[-1].exitcode == ExitCode.CRITICAL:
+                    logger.info("Skipping the remaining NCCL tests (--fail-fast)")
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        exit_code = max((output.exitcode for output in outputs), default=ExitCode.OK)
 
         sys.exit(exit_code.value)
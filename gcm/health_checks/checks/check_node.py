@@ -2,7 +2,7 @@
 # All rights reserved.
 import logging
 import os
-import socket
+import re
 import sys
 from contextlib import ExitStack
 from dataclasses import dataclass
@@ -10,7 +10,7 @@ from typing import Collection, Optional, Protocol, Tuple
 
 import click
 
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -32,10 +32,41 @@ from gcm.monitoring.features.gen.generated_features_healthchecksfeatures import
     FeatureValueHealthChecksFeatures,
 )
 from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
-from gcm.monitoring.utils.monitor import init_logger
+from gcm.monitoring.utils.monitor import init_logger_once
 from gcm.schemas.health_check.health_check_name import HealthCheckName
 from typeguard import typechecked
 
+PROC_MODULES_PATH = "/proc/modules"
+PROC_UPTIME_PATH = "/proc/uptime"
+_LSMOD_HEADER = "Module Size Used by"
+
+
+def read_uptime_secs(proc_uptime: str = PROC_UPTIME_PATH) -> str:
+    """Return the whole seconds of uptime, as `awk -F. '{ print $1 }'` would."""
+    with open(proc_uptime) as f:
+        return f.read().split(".", 1)[0]
+
+
+def count_lsmod_matches(module: str, proc_modules: str = PROC_MODULES_PATH) -> int:
+    """Count the lines `lsmod | grep <module>` would print, reading /proc/modules.
+
+    lsmod prints a header and then the name, size, use count and users of each
+    /proc/modules entry, so `module` is searched as a regular expression in those
+    lines. Raises `re.error` if `module` is not a valid pattern.
+    """
+    pattern = re.compile(module)
+    count = 1 if pattern.search(_LSMOD_HEADER) else 0
+    with open(proc_modules) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 4:
+                continue
+            name, size, use_count, users = fields[:4]
+            users = "" if users == "-" else users.rstrip(",")
+            if pattern.search(f"{name} {size} {use_count} {users}"):
+                count += 1
+    return count
+
 
 @click.group()
 def check_node() -> None:
@@ -66,22 +97,34 @@ class NodeCheckImpl:
     def get_uptime(
         self, timeout_secs: int, logger: logging.Logger
     ) -> PipedShellCommandOut:
+        try:
+            return PipedShellCommandOut([0], read_uptime_secs())
+        except OSError as e:
+            logger.warning(f"Could not read {PROC_UPTIME_PATH}: {e}")
+
         cmd = ["cat /proc/uptime", "awk -F. '{ print $1 }'"]
-        logger.info(f"Running command: {' | '.join(cmd)}")
+        logger.info("Running command: %s", " | ".join(cmd))
         return piped_shell_command(cmd, timeout_secs)
 
     def get_module(
         self, timeout_secs: int, module: str, logger: logging.Logger
     ) -> PipedShellCommandOut:
+        try:
+            return PipedShellCommandOut([0], str(count_lsmod_matches(module)))
+        except OSError as e:
+            logger.warning(f"Could not read {PROC_MODULES_PATH}: {e}")
+        except re.error as e:
+            logger.warning(f"Could not match {module!r} as a regex: {e}")
+
         cmd = ["lsmod", f"grep {module}", "wc -l"]
-        logger.info(f"Running command: {' | '.join(cmd)}")
+        logger.info("Running command: %s", " | ".join(cmd))
         return piped_shell_command(cmd, timeout_secs)
 
     def get_dnf_repos(
         self, timeout_secs: int, logger: logging.Logger
     ) -> ShellCommandOut:
         cmd = "dnf repolist -v --refresh"
-        logger.info(f"Running command '{cmd}'")
+        logger.info("Running command '%s'", cmd)
         return shell_command(cmd, timeout_secs)
 
 
@@ -132,21 +175,21 @@ def uptime(
 ) -> None:
     """Check if the node recently booted"""
 
-    node: str = socket.gethostname()
-    logger, _ = init_logger(
+    node: str = get_hostname()
+    logger, _ = init_logger_once(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
         log_name=node + ".log",
         log_level=getattr(logging, log_level),
     )
     logger.info(
-        f"check-node uptime: cluster: {cluster}, node: {node}, type: {type}, uptime-threshold: {uptime_threshold}."
+        "check-node uptime: cluster: %s, node: %s, type: %s, uptime-threshold: %s.",
+        cluster,
+        node,
+        type,
+        uptime_threshold,
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
     if obj is None:
         obj = NodeCheckImpl(cluster, type, log_level, log_folder)
 
@@ -197,7 +240,7 @@ def uptime(
             uptime_out.stdout, uptime_out.returncode[0], uptime_threshold
         )
 
-        logger.info(f"exit code {exit_code}: {msg}")
+        logger.info("exit code %s: %s", exit_code, msg)
 
         sys.exit(exit_code.value)
 
@@ -238,7 +281,8 @@ def process_module(
     type=click.STRING,
     multiple=True,
     required=True,
-    help="The module to check",
+    help="The module to check. It is matched like `lsmod | grep <module>`, as a "
+    "regular expression (Python syntax) against the lsmod output lines.",
 )
 @click.option(
     "--mod_count",
@@ -266,21 +310,22 @@ def check_module(
 ) -> None:
     """Check if the node recently booted"""
 
-    node: str = socket.gethostname()
-    logger, _ = init_logger(
+    node: str = get_hostname()
+    logger, _ = init_logger_once(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
         log_name=node + ".log",
         log_level=getattr(logging, log_level),
     )
     logger.info(
-        f"check-node check-module: cluster: {cluster}, node: {node}, type: {type}, module: {module}, mod_count: {mod_count}."
+        "check-node check-module: cluster: %s, node: %s, type: %s, module: %s, mod_count: %s.",
+        cluster,
+        node,
+        type,
+        module,
+        mod_count,
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -342,7 +387,7 @@ def check_module(
             if exit_code > overall_exit_code:
                 overall_exit_code = exit_code
 
-        logger.info(f"exit code {overall_exit_code}: {overall_msg}")
+        logger.info("exit code %s: %s", overall_exit_code, overall_msg)
 
         sys.exit(overall_exit_code.value)
 
@@ -384,21 +429,17 @@ def check_dnf_repos(
 ) -> None:
     """Check that the dnf repos are reachable"""
 
-    node: str = socket.gethostname()
-    logger, _ = init_logger(
+    node: str = get_hostname()
+    logger, _ = init_logger_once(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
         log_name=node + ".log",
         log_level=getattr(logging, log_level),
     )
     logger.info(
-        f"check-node dnf-repos: cluster: {cluster}, node: {node}, type: {type}."
+        "check-node dnf-repos: cluster: %s, node: %s, type: %s.", cluster, node, type
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -449,6 +490,6 @@ def check_dnf_repos(
             dnf_repos_out.stdout, dnf_repos_out.returncode
         )
 
-        logger.info(f"exit code {exit_code}: {msg}")
+        logger.info("exit code %s: %s", exit_code, msg)
 
         sys.exit(exit_code.value)
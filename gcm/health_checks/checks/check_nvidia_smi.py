@@ -2,7 +2,6 @@
 # All rights reserved.
 import logging
 import os
-import socket
 import sys
 import time
 from contextlib import ExitStack
@@ -11,6 +10,7 @@ from typing import (
     Any,
     Callable,
     Collection,
+    Dict,
     Iterable,
     List,
     Literal,
@@ -21,15 +21,19 @@ from typing import (
 
 import click
 
-import gni_lib
 import psutil
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
-from gcm.health_checks.check_utils.telem import TelemetryContext
+from gcm.health_checks.check_utils.telem import TelemetryBatch, TelemetryContext
 from gcm.health_checks.click import common_arguments, telemetry_argument
 from gcm.health_checks.device_telemetry_exception_handling import (
     handle_device_telemetry_exception,
 )
-from gcm.health_checks.device_telemetry_utils import get_gpu_devices
+from gcm.health_checks.device_telemetry_utils import (
+    CachedDeviceTelemetryClient,
+    get_gpu_devices,
+    query_devices,
+)
 from gcm.health_checks.env_variables import EnvCtx
 from gcm.health_checks.measurement_units import convert_bytes
 from gcm.health_checks.types import CHECK_TYPE, CheckEnv, ExitCode
@@ -38,6 +42,7 @@ from gcm.monitoring.click import heterogeneous_cluster_v1_option
 from gcm.monitoring.device_telemetry_client import (
     DeviceTelemetryClient,
     DeviceTelemetryException,
+    GPUDevice,
 )
 from gcm.monitoring.device_telemetry_nvml import NVMLDeviceTelemetryClient
 from gcm.monitoring.features.gen.generated_features_healthchecksfeatures import (
@@ -47,7 +52,6 @@ from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
 from gcm.monitoring.utils.monitor import init_logger
 from gcm.schemas.gpu.process import ProcessInfo
 from gcm.schemas.health_check.health_check_name import HealthCheckName
-from typeguard import typechecked
 
 
 class NvidiaSmiCli(CheckEnv, Protocol):
@@ -125,6 +129,8 @@ def attempt_check_running_procs(
 ) -> Tuple[List[ProcessInfo], ExitCode, str]:
     exit_code = ExitCode.OK
     pids = []
+    # a process can hold contexts on several GPUs, only look each pid up once
+    pid_exists: Dict[int, bool] = {}
 
     for device in devices:
         try:
@@ -140,10 +146,11 @@ def attempt_check_running_procs(
                 proc_pids = [p_id.pid for p_id in pids]
                 msg += f"running_procs check: attempt #{attempt}: GPU {device} is occupied by {len(pids)} other processes. pids: {proc_pids}\n"
 
+                for proc_pid in proc_pids:
+                    if proc_pid not in pid_exists:
+                        pid_exists[proc_pid] = psutil.pid_exists(proc_pid)
                 non_existent_pids = [
-                    proc_pid
-                    for proc_pid in proc_pids
-                    if not psutil.pid_exists(proc_pid)
+                    proc_pid for proc_pid in proc_pids if not pid_exists[proc_pid]
                 ]
                 if non_existent_pids:
                     msg += f"running_procs check: attempt #{attempt}: found pids that are non existent but still occupy GPUs {non_existent_pids}\n"
@@ -181,7 +188,7 @@ def kill_processes(
 
     # Wait for them to terminate (up to 'timeout' seconds)
     gone, alive = psutil.wait_procs(procs, timeout=timeout)
-    (_, exit_code, msg) = attempt_check_running_procs(
+    _, exit_code, msg = attempt_check_running_procs(
         attempt, devices, msg, device_telemetry
     )
 
@@ -221,7 +228,7 @@ def check_and_kill_running_procs(
         # This will restore the environment variable on exit
         with EnvCtx({"CUDA_VISIBLE_DEVICES": None}):
             for attempt in range(retry_count):
-                (pids, attempt_exit_code, msg) = attempt_check_running_procs(
+                pids, attempt_exit_code, msg = attempt_check_running_procs(
                     attempt, devices, msg, device_telemetry
                 )
                 if attempt_exit_code == ExitCode.OK:
@@ -235,7 +242,7 @@ def check_and_kill_running_procs(
         if force_kill_process and pids:
             proc_pids = [p_id.pid for p_id in pids]
             msg += f"running_procs check: force killed pids: {proc_pids}\n"
-            (is_killed, msg) = kill_processes(
+            is_killed, msg = kill_processes(
                 proc_pids, retry_count, devices, msg, device_telemetry
             )
             if is_killed:
@@ -269,31 +276,34 @@ def check_app_clock_freq(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            clock_info = handle.get_clock_freq()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, clock_info in query_devices(
+        device_telemetry, range(device_count), lambda gpu: gpu.get_clock_freq()
+    ):
+        if isinstance(clock_info, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(clock_info)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"clock_freq check: GPU {device}: {error_msg}"
+            msgs.append(f"clock_freq check: GPU {device}: {error_msg}")
         else:
             if (
                 clock_info.graphics_freq < gpu_app_freq
                 or clock_info.memory_freq < gpu_app_mem_freq
             ):
-                msg += f"clock_freq check: exit_code: {ExitCode.CRITICAL}, GPU {device} has less application freq than expected. Expected: (GPU, GPU_mem) {gpu_app_freq}, {gpu_app_mem_freq} and got {clock_info.graphics_freq}, {clock_info.memory_freq}.\n"
+                msgs.append(
+                    f"clock_freq check: exit_code: {ExitCode.CRITICAL}, GPU {device} has less application freq than expected. Expected: (GPU, GPU_mem) {gpu_app_freq}, {gpu_app_mem_freq} and got {clock_info.graphics_freq}, {clock_info.memory_freq}.\n"
+                )
                 exit_code = ExitCode.CRITICAL
 
     if exit_code == ExitCode.OK:
-        msg = f"clock_freq check: exit_code: {ExitCode.OK}, Application frequencies are as expected.\n"
-    return exit_code, msg
+        msgs = [
+            f"clock_freq check: exit_code: {ExitCode.OK}, Application frequencies are as expected.\n"
+        ]
+    return exit_code, "".join(msgs)
 
 
 def check_gpu_temp(
@@ -315,28 +325,31 @@ def check_gpu_temp(
         )
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            gpu_temperature = handle.get_temperature()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, gpu_temperature in query_devices(
+        device_telemetry, range(device_count), lambda gpu: gpu.get_temperature()
+    ):
+        if isinstance(gpu_temperature, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(gpu_temperature)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"gpu_temp check: GPU {device}: {error_msg}"
+            msgs.append(f"gpu_temp check: GPU {device}: {error_msg}")
         else:
             if gpu_temperature > gpu_temperature_threshold:
                 exit_code = ExitCode.CRITICAL
-                msg += f"gpu_temp check: exit_code: {ExitCode.CRITICAL}, GPU {device} has temperature: {gpu_temperature}, higher than critical threshold of {gpu_temperature_threshold}.\n"
+                msgs.append(
+                    f"gpu_temp check: exit_code: {ExitCode.CRITICAL}, GPU {device} has temperature: {gpu_temperature}, higher than critical threshold of {gpu_temperature_threshold}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"gpu_temp check: exit_code: {ExitCode.OK}, all GPU temperatures are lower than max threshold, {gpu_temperature_threshold}.\n"
-    return exit_code, msg
+        msgs = [
+            f"gpu_temp check: exit_code: {ExitCode.OK}, all GPU temperatures are lower than max threshold, {gpu_temperature_threshold}.\n"
+        ]
+    return exit_code, "".join(msgs)
 
 
 def check_mem_usage(
@@ -361,32 +374,41 @@ def check_mem_usage(
         return ExitCode.OK, "mem_usage check: No GPU devices were found."
     else:
         exit_code = ExitCode.OK
-        msg = ""
+        msgs: List[str] = []
 
         # This will restore the environment variable on exit
         with EnvCtx({"CUDA_VISIBLE_DEVICES": None}):
-            for device in devices:
-                try:
-                    handle = device_telemetry.get_device_by_index(device)
-                    memory_info = handle.get_memory_info()
-                except DeviceTelemetryException as e:
-                    error_code, error_msg = handle_device_telemetry_exception(e)
+            for device, memory_info in query_devices(
+                device_telemetry, devices, lambda gpu: gpu.get_memory_info()
+            ):
+                if isinstance(memory_info, DeviceTelemetryException):
+                    error_code, error_msg = handle_device_telemetry_exception(
+                        memory_info
+                    )
                     if error_code > exit_code:
                         exit_code = error_code
-                    msg += f"mem_usage check: GPU {device}: {error_msg}"
+                    msgs.append(f"mem_usage check: GPU {device}: {error_msg}")
                 else:
-                    if convert_bytes(memory_info.used, "MiB") > gpu_mem_usage_threshold:
-                        msg += f"mem_usage check: GPU {device} mem usage: {convert_bytes(memory_info.used, 'MiB')} is higher than threshold: {gpu_mem_usage_threshold}.\n"
+                    used_mib = convert_bytes(memory_info.used, "MiB")
+                    if used_mib > gpu_mem_usage_threshold:
+                        msgs.append(
+                            f"mem_usage check: GPU {device} mem usage: {used_mib} is higher than threshold: {gpu_mem_usage_threshold}.\n"
+                        )
                         exit_code = ExitCode.CRITICAL
 
         if exit_code == ExitCode.OK:
-            msg = f"mem_usage check: all GPUs have mem usage lower than threshold: {gpu_mem_usage_threshold}.\n"
+            msgs = [
+                f"mem_usage check: all GPUs have mem usage lower than threshold: {gpu_mem_usage_threshold}.\n"
+            ]
 
-        return exit_code, msg
+        return exit_code, "".join(msgs)
 
 
 def get_retired_pages_count(source: Callable[[], Iterable[int]]) -> int:
-    return sum(1 for _ in source())
+    pages = source()
+    if isinstance(pages, Collection):
+        return len(pages)
+    return sum(1 for _ in pages)
 
 
 def check_retired_pages(
@@ -402,39 +424,48 @@ def check_retired_pages(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            ret_pages_single_bit = get_retired_pages_count(
-                handle.get_retired_pages_multiple_single_bit_ecc_errors
-            )
-            ret_pages_double_bit = get_retired_pages_count(
-                handle.get_retired_pages_double_bit_ecc_error
-            )
-            pending_ret_pages_status = handle.get_retired_pages_pending_status()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    def get_retired_pages(gpu: GPUDevice) -> Tuple[int, int, int]:
+        return (
+            get_retired_pages_count(
+                gpu.get_retired_pages_multiple_single_bit_ecc_errors
+            ),
+            get_retired_pages_count(gpu.get_retired_pages_double_bit_ecc_error),
+            gpu.get_retired_pages_pending_status(),
+        )
+
+    for device, retired_pages in query_devices(
+        device_telemetry, range(device_count), get_retired_pages
+    ):
+        if isinstance(retired_pages, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(retired_pages)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"gpu_retired_pages check: GPU {device}: {error_msg}"
+            msgs.append(f"gpu_retired_pages check: GPU {device}: {error_msg}")
         else:
+            ret_pages_single_bit, ret_pages_double_bit, pending_ret_pages_status = (
+                retired_pages
+            )
             if (
                 ret_pages_single_bit > gpu_retired_pages_threshold
                 or ret_pages_double_bit > gpu_retired_pages_threshold
                 or pending_ret_pages_status > 0
             ):
                 exit_code = ExitCode.CRITICAL
-                msg += f"gpu_retired_pages check: exit_code: {ExitCode.CRITICAL}, GPU {device} has single/double/pending status pages: {ret_pages_single_bit}/{ret_pages_double_bit}/{pending_ret_pages_status}. Retired pages threshold is {gpu_retired_pages_threshold}.\n"
+                msgs.append(
+                    f"gpu_retired_pages check: exit_code: {ExitCode.CRITICAL}, GPU {device} has single/double/pending status pages: {ret_pages_single_bit}/{ret_pages_double_bit}/{pending_ret_pages_status}. Retired pages threshold is {gpu_retired_pages_threshold}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"gpu_retired_pages check: exit_code: {ExitCode.OK}, all GPUs have pending retired pages and retired pages below the max threshold, {gpu_retired_pages_threshold}.\n"
-    return exit_code, msg
+        msgs = [
+            f"gpu_retired_pages check: exit_code: {ExitCode.OK}, all GPUs have pending retired pages and retired pages below the max threshold, {gpu_retired_pages_threshold}.\n"
+        ]
+    return exit_code, "".join(msgs)
 
 
 def check_ecc_uncorrected_volatile_total(
@@ -450,30 +481,37 @@ def check_ecc_uncorrected_volatile_total(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            ecc_uncorrected = handle.get_ecc_uncorrected_volatile_total()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, ecc_uncorrected in query_devices(
+        device_telemetry,
+        range(device_count),
+        lambda gpu: gpu.get_ecc_uncorrected_volatile_total(),
+    ):
+        if isinstance(ecc_uncorrected, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(ecc_uncorrected)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"ecc_uncorrected_volatile_total check: GPU {device}: {error_msg}"
+            msgs.append(
+                f"ecc_uncorrected_volatile_total check: GPU {device}: {error_msg}"
+            )
         else:
             if ecc_uncorrected > ecc_uncorrected_volatile_threshold:
                 exit_code = ExitCode.CRITICAL
-                msg += f"ecc_uncorrected_volatile_total check: exit_code: {ExitCode.CRITICAL}, GPU {device} has ECC uncorrected: {ecc_uncorrected} above the threshold of {ecc_uncorrected_volatile_threshold}.\n"
+                msgs.append(
+                    f"ecc_uncorrected_volatile_total check: exit_code: {ExitCode.CRITICAL}, GPU {device} has ECC uncorrected: {ecc_uncorrected} above the threshold of {ecc_uncorrected_volatile_threshold}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"ecc_uncorrected_volatile_total check: exit_code: {ExitCode.OK}, all GPUs have ECC errors below the threshold of {ecc_uncorrected_volatile_threshold}.\n"
+        msgs = [
+            f"ecc_uncorrected_volatile_total check: exit_code: {ExitCode.OK}, all GPUs have ECC errors below the threshold of {ecc_uncorrected_volatile_threshold}.\n"
+        ]
 
-    return exit_code, msg
+    return exit_code, "".join(msgs)
 
 
 def check_ecc_corrected_volatile_total(
@@ -489,30 +527,37 @@ def check_ecc_corrected_volatile_total(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            ecc_corrected = handle.get_ecc_corrected_volatile_total()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, ecc_corrected in query_devices(
+        device_telemetry,
+        range(device_count),
+        lambda gpu: gpu.get_ecc_corrected_volatile_total(),
+    ):
+        if isinstance(ecc_corrected, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(ecc_corrected)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"ecc_corrected_volatile_total check: GPU {device}: {error_msg}"
+            msgs.append(
+                f"ecc_corrected_volatile_total check: GPU {device}: {error_msg}"
+            )
         else:
             if ecc_corrected > ecc_corrected_volatile_threshold:
                 exit_code = ExitCode.CRITICAL
-                msg += f"ecc_corrected_volatile_total check: exit_code: {ExitCode.CRITICAL}, GPU {device} has ECC corrected: {ecc_corrected} above the threshold of {ecc_corrected_volatile_threshold}.\n"
+                msgs.append(
+                    f"ecc_corrected_volatile_total check: exit_code: {ExitCode.CRITICAL}, GPU {device} has ECC corrected: {ecc_corrected} above the threshold of {ecc_corrected_volatile_threshold}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"ecc_corrected_volatile_total check: exit_code: {ExitCode.OK}, all GPUs have ECC errors below the threshold of {ecc_corrected_volatile_threshold}.\n"
+        msgs = [
+            f"ecc_corrected_volatile_total check: exit_code: {ExitCode.OK}, all GPUs have ECC errors below the threshold of {ecc_corrected_volatile_threshold}.\n"
+        ]
 
-    return exit_code, msg
+    return exit_code, "".join(msgs)
 
 
 def check_vbios_mismatch(
@@ -529,32 +574,34 @@ def check_vbios_mismatch(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            vbios_version = handle.get_vbios_version()
-            if expected_vbios == "":
-                expected_vbios = vbios_version
-            elif expected_vbios != vbios_version:
-                exit_code = ExitCode.CRITICAL
-                msg += f"vbios mismatch mismatch: exit_code: {ExitCode.CRITICAL}, Expect '{expected_vbios}' Found '{vbios_version}'\n"
-
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, vbios_version in query_devices(
+        device_telemetry, range(device_count), lambda gpu: gpu.get_vbios_version()
+    ):
+        if isinstance(vbios_version, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(vbios_version)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"vbios mismatch check: GPU {device}: {error_msg}"
+            msgs.append(f"vbios mismatch check: GPU {device}: {error_msg}")
+        elif expected_vbios == "":
+            expected_vbios = vbios_version
+        elif expected_vbios != vbios_version:
+            exit_code = ExitCode.CRITICAL
+            msgs.append(
+                f"vbios mismatch mismatch: exit_code: {ExitCode.CRITICAL}, Expect '{expected_vbios}' Found '{vbios_version}'\n"
+            )
 
     if exit_code == ExitCode.OK:
-        msg = f"vbios mismatch check: exit_code: {ExitCode.OK}, all GPUs have a consistent vbios version.\n"
+        msgs = [
+            f"vbios mismatch check: exit_code: {ExitCode.OK}, all GPUs have a consistent vbios version.\n"
+        ]
 
-    return exit_code, msg
+    return exit_code, "".join(msgs)
 
 
 def check_row_remap(
@@ -568,30 +615,33 @@ def check_row_remap(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            row_remaps = handle.get_remapped_rows()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, row_remaps in query_devices(
+        device_telemetry, range(device_count), lambda gpu: gpu.get_remapped_rows()
+    ):
+        if isinstance(row_remaps, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(row_remaps)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"row_remap check: GPU {device}: {error_msg}"
+            msgs.append(f"row_remap check: GPU {device}: {error_msg}")
         else:
             if row_remaps.pending > 0 or row_remaps.failure > 0:
                 exit_code = ExitCode.CRITICAL
-                msg += f"row_remap check: exit_code: {ExitCode.CRITICAL}, GPU {device} has pending or failed row remaps: pending/failure/correctable/uncorrectable: {row_remaps.pending}/{row_remaps.failure}/{row_remaps.correctable}/{row_remaps.uncorrectable}.\n"
+                msgs.append(
+                    f"row_remap check: exit_code: {ExitCode.CRITICAL}, GPU {device} has pending or failed row remaps: pending/failure/correctable/uncorrectable: {row_remaps.pending}/{row_remaps.failure}/{row_remaps.correctable}/{row_remaps.uncorrectable}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"row_remap check: exit_code: {ExitCode.OK}, all GPUs do not have row remap failures or pending remaps.\n"
+        msgs = [
+            f"row_remap check: exit_code: {ExitCode.OK}, all GPUs do not have row remap failures or pending remaps.\n"
+        ]
 
-    return exit_code, msg
+    return exit_code, "".join(msgs)
 
 
 def check_row_remap_pending(
@@ -605,30 +655,33 @@ def check_row_remap_pending(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            row_remaps = handle.get_remapped_rows()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, row_remaps in query_devices(
+        device_telemetry, range(device_count), lambda gpu: gpu.get_remapped_rows()
+    ):
+        if isinstance(row_remaps, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(row_remaps)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"row_remap_pending check: GPU {device}: {error_msg}"
+            msgs.append(f"row_remap_pending check: GPU {device}: {error_msg}")
         else:
             if row_remaps.pending > 0:
                 exit_code = ExitCode.CRITICAL
-                msg += f"row_remap_pending check: exit_code: {ExitCode.CRITICAL}, GPU {device} has pending row remaps: pending/failure/correctable/uncorrectable: {row_remaps.pending}/{row_remaps.failure}/{row_remaps.correctable}/{row_remaps.uncorrectable}.\n"
+                msgs.append(
+                    f"row_remap_pending check: exit_code: {ExitCode.CRITICAL}, GPU {device} has pending row remaps: pending/failure/correctable/uncorrectable: {row_remaps.pending}/{row_remaps.failure}/{row_remaps.correctable}/{row_remaps.uncorrectable}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"row_remap_pending check: exit_code: {ExitCode.OK}, all GPUs do not have pending remaps.\n"
+        msgs = [
+            f"row_remap_pending check: exit_code: {ExitCode.OK}, all GPUs do not have pending remaps.\n"
+        ]
 
-    return exit_code, msg
+    return exit_code, "".join(msgs)
 
 
 def check_row_remap_failed(
@@ -642,30 +695,33 @@ def check_row_remap_failed(
         return ExitCode.OK, msg
 
     exit_code = ExitCode.OK
-    msg = ""
+    msgs: List[str] = []
     try:
         device_count = device_telemetry.get_device_count()
     except DeviceTelemetryException as e:
         return handle_device_telemetry_exception(e)
 
-    for device in range(device_count):
-        try:
-            handle = device_telemetry.get_device_by_index(device)
-            row_remaps = handle.get_remapped_rows()
-        except DeviceTelemetryException as e:
-            error_code, error_msg = handle_device_telemetry_exception(e)
+    for device, row_remaps in query_devices(
+        device_telemetry, range(device_count), lambda gpu: gpu.get_remapped_rows()
+    ):
+        if isinstance(row_remaps, DeviceTelemetryException):
+            error_code, error_msg = handle_device_telemetry_exception(row_remaps)
             if error_code > exit_code:
                 exit_code = error_code
-            msg += f"row_remap_failed check: GPU {device}: {error_msg}"
+            msgs.append(f"row_remap_failed check: GPU {device}: {error_msg}")
         else:
             if row_remaps.failure > 0:
                 exit_code = ExitCode.CRITICAL
-                msg += f"row_remap_failed check: exit_code: {ExitCode.CRITICAL}, GPU {device} has failed row remaps: pending/failure/correctable/uncorrectable: {row_remaps.pending}/{row_remaps.failure}/{row_remaps.correctable}/{row_remaps.uncorrectable}.\n"
+                msgs.append(
+                    f"row_remap_failed check: exit_code: {ExitCode.CRITICAL}, GPU {device} has failed row remaps: pending/failure/correctable/uncorrectable: {row_remaps.pending}/{row_remaps.failure}/{row_remaps.correctable}/{row_remaps.uncorrectable}.\n"
+                )
 
     if exit_code == ExitCode.OK:
-        msg = f"row_remap_failed check: exit_code: {ExitCode.OK}, all GPUs do not have row remap failures.\n"
+        msgs = [
+            f"row_remap_failed check: exit_code: {ExitCode.OK}, all GPUs do not have row remap failures.\n"
+        ]
 
-    return exit_code, msg
+    return exit_code, "".join(msgs)
 
 
 class TemperatureRequiredOption(click.Option):
@@ -776,7 +832,6 @@ class TemperatureRequiredOption(click.Option):
     help="Whether the health check should force-kill the running process.",
 )
 @click.pass_obj
-@typechecked
 def check_nvidia_smi(
     obj: Optional[NvidiaSmiCli],
     cluster: str,
@@ -802,7 +857,7 @@ def check_nvidia_smi(
     running_procs_force_kill: bool,
 ) -> None:
     """Perform nvidia-smi checks to assess the state of the GPUs"""
-    node: str = socket.gethostname()
+    node: str = get_hostname()
     logger, _ = init_logger(
         logger_name=type,
         log_dir=os.path.join(log_folder, type + "_logs"),
@@ -814,11 +869,7 @@ def check_nvidia_smi(
         f"check_nvidia_smi: check: {check} cluster: {cluster}, node: {node}, type: {type}"
     )
     logger.info(f"{gpu_num=}, {gpu_app_freq=}, {gpu_mem_usage_threshold=}")
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -832,8 +883,25 @@ def check_nvidia_smi(
     overall_exit_code = ExitCode.UNKNOWN
     overall_msg = ""
 
+    # checked before NVML is initialized, so a disabled check does not touch the GPUs
+    ff = FeatureValueHealthChecksFeatures()
+    if ff.get_healthchecksfeatures_disable_nvidia_smi():
+        with OutputContext(
+            type,
+            HealthCheckName.NVIDIA_SMI,
+            lambda: (overall_exit_code, overall_msg),
+            verbose_out,
+        ):
+            overall_exit_code = ExitCode.OK
+            overall_msg = (
+                f"{HealthCheckName.NVIDIA_SMI.value} is disabled by killswitch."
+            )
+            logger.info(overall_msg)
+            sys.exit(overall_exit_code.value)
+
     try:
-        device_telemetry = obj.get_device_telemetry()
+        # shared by all selected checks, so each handle is only resolved once
+        device_telemetry = CachedDeviceTelemetryClient(obj.get_device_telemetry())
     except DeviceTelemetryException as e:
         with ExitStack() as s:
             s.enter_context(
@@ -955,36 +1023,33 @@ def check_nvidia_smi(
         lambda: (overall_exit_code, overall_msg),
         verbose_out,
     ):
-        ff = FeatureValueHealthChecksFeatures()
-        if ff.get_healthchecksfeatures_disable_nvidia_smi():
-            overall_exit_code = ExitCode.OK
-            overall_msg = (
-                f"{HealthCheckName.NVIDIA_SMI.value} is disabled by killswitch."
-            )
-            logger.info(overall_msg)
-            sys.exit(overall_exit_code.value)
-
-        for check_id, check_name, run_check in nvidia_check:
-            if check_id not in check:
-                continue
-            exit_code = ExitCode.UNKNOWN
-            msg = ""
-            with TelemetryContext(
-                sink=sink,
-                sink_opts=sink_opts,
-                logger=logger,
-                cluster=cluster,
-                derived_cluster=derived_cluster,
-                type=type,
-                name=check_name.value,
-                node=node,
-                get_exit_code_msg=lambda: (exit_code, msg),
-                gpu_node_id=gpu_node_id,
-            ):
-                exit_code, msg = run_check()
-                overall_msg += msg
-                if exit_code > overall_exit_code:
-                    overall_exit_code = exit_code
+        enabled_checks = frozenset(check)
+        # the per check records are written to the sink together once all ran
+        with TelemetryBatch(
+            sink=sink, sink_opts=sink_opts, logger=logger
+        ) as telemetry_batch:
+            for check_id, check_name, run_check in nvidia_check:
+                if check_id not in enabled_checks:
+                    continue
+                exit_code = ExitCode.UNKNOWN
+                msg = ""
+                with TelemetryContext(
+                    sink=sink,
+                    sink_opts=sink_opts,
+                    logger=logger,
+                    cluster=cluster,
+                    derived_cluster=derived_cluster,
+                    type=type,
+                    name=check_name.value,
+                    node=node,
+                    get_exit_code_msg=lambda: (exit_code, msg),
+                    gpu_node_id=gpu_node_id,
+                    batch=telemetry_batch,
+                ):
+                    exit_code, msg = run_check()
+                    overall_msg += msg
+                    if exit_code > overall_exit_code:
+                        overall_exit_code = exit_code
 
         logger.info(f"Overall exit code {overall_exit_code}\n{overall_msg}")
         sys.exit(overall_exit_code.value)
@@ -4,7 +4,6 @@
 
 import json
 import logging
-import socket
 import sys
 from collections.abc import Collection
 from contextlib import ExitStack
@@ -13,9 +12,10 @@ from pathlib import Path
 from typing import Any, NamedTuple, Optional, Protocol
 
 import click
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.output_utils import CheckOutput, Metric
+from gcm.health_checks.check_utils.sysfs import read_sysfs_attr
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import common_arguments, telemetry_argument
 from gcm.health_checks.types import CHECK_TYPE, CheckEnv, ExitCode, LOG_LEVEL
@@ -28,7 +28,6 @@ from gcm.monitoring.slurm.derived_cluster import get_derived_cluster
 from gcm.monitoring.utils.monitor import init_logger
 from gcm.schemas.health_check.health_check_name import HealthCheckName
 from pydantic import BaseModel
-from typeguard import typechecked
 
 
 class PciLink(NamedTuple):
@@ -85,13 +84,9 @@ class PciCheckImpl:
         """Return an object created from a `/sys' filesystem entry."""
         pci_slot_data = pci_slot.split(":")
         pci_slot_key = ":".join(pci_slot_data[0:2])
-        sysfs_device_path = (
-            Path("/sys/class/pci_bus") / pci_slot_key / "device" / pci_slot
-        )
-        sysfs_device_link_speed_path = sysfs_device_path / "current_link_speed"
-        sysfs_device_link_width_path = sysfs_device_path / "current_link_width"
-        sysfs_link_speed = _read_sysfs_val(sysfs_device_link_speed_path) or None
-        sysfs_link_width = _read_sysfs_val(sysfs_device_link_width_path) or None
+        sysfs_device_path = f"/sys/class/pci_bus/{pci_slot_key}/device/{pci_slot}/"
+        sysfs_link_speed = _read_sysfs_val(sysfs_device_path + "current_link_speed")
+        sysfs_link_width = _read_sysfs_val(sysfs_device_path + "current_link_width")
         sysfs_link_width_int = int(sysfs_link_width) if sysfs_link_width else None
         return PciLink(pci_slot, sysfs_link_speed, sysfs_link_width_int)
 
@@ -100,11 +95,12 @@ class PciCheckImpl:
         return json.loads(Path(manifest_file).read_text(encoding="utf-8"))
 
 
-def _read_sysfs_val(path: Path) -> Optional[str]:
-    """Read the value stored in a `/sys` filesystem path."""
-    if path.exists():
-        return path.read_text(encoding="utf-8").strip()
-    return None
+def _read_sysfs_val(path: str) -> Optional[str]:
+    """Read the value stored in a `/sys` filesystem path, None if missing or empty."""
+    try:
+        return read_sysfs_attr(path) or None
+    except FileNotFoundError:
+        return None
 
 
 def check_pci_state(
@@ -122,9 +118,9 @@ def check_pci_state(
         slot = link.pci_slot
         device = monitored_devices.devices[slot]
         name = device.slot
-        logger.debug(f"Checking status of PCI device {slot}")
-        logger.debug(f"manifest = {device}")
-        logger.debug(f"slot {slot}: x{link.link_width} @ {link.link_speed}")
+        logger.debug("Checking status of PCI device %s", slot)
+        logger.debug("manifest = %s", device)
+        logger.debug("slot %s: x%s @ %s", slot, link.link_width, link.link_speed)
         if not link.link_exists:
             check.check_status = ExitCode.CRITICAL
             msg = f"{name} is not present at {slot}."
@@ -138,7 +134,7 @@ def check_pci_state(
             if device.topology_critical:
                 break
         else:
-            logger.debug(f"{name} is present at {slot}.")
+            logger.debug("%s is present at %s.", name, slot)
             expected_speed = device.link_speed or [""]
             if (
                 link.link_width != device.link_width
@@ -190,7 +186,6 @@ def check_pci_state(
 @heterogeneous_cluster_v1_option
 @click.option("--manifest_file", default="/etc/manifest.json")
 @click.pass_obj
-@typechecked
 def check_pci(
     obj: Optional[PciCheck],
     cluster: str,
@@ -204,7 +199,7 @@ def check_pci(
     manifest_file: str,
 ) -> None:
     """Check pci subsystem against the manifest file."""
-    node: str = socket.gethostname()
+    node: str = get_hostname()
     logger, _ = init_logger(
         logger_name=type,
         log_dir=f"{log_folder}/{type}_logs",
@@ -216,11 +211,7 @@ def check_pci(
         f"check_pci: cluster: {cluster}, node: {node}, type: {type} "
         f"manifest file: {manifest_file}"
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
@@ -42,6 +42,10 @@ from gcm.monitoring.utils.monitor import init_logger
 from gcm.schemas.health_check.health_check_name import HealthCheckName
 from typeguard import typechecked
 
+_BUDDYINFO_RE = re.compile(
+    r"^\s*Node\s+(?P<node>\d+).*zone\s+(?P<zone>\w+)\s+(?P<blocks>[\d ]+\s*$)"
+)
+
 
 @click.group()
 def check_processor() -> None:
@@ -547,21 +551,15 @@ def check_mem_size(
 def parse_buddy_info_lines(
     buddyinfo_lines: Iterable[str], order: int
 ) -> Iterable[Tuple[str, str, List[int]]]:
-    def parse(line: str) -> Tuple[str, str, List[int]]:
-        match_result = re.match(
-            "^\\s*Node\\s+(?P<node>\\d+).*zone\\s+(?P<zone>\\w+)\\s+(?P<blocks>[\\d ]+\\s*$)",
-            line,
-        )
-        if match_result is not None:
-            d: Dict[str, str] = match_result.groupdict()
-            blocks = list(map(int, d["blocks"].split()))
-            return d["node"], d["zone"], blocks[order:]
-        else:
+    for line in buddyinfo_lines:
+        match_result = _BUDDYINFO_RE.match(line)
+        if match_result is None:
             raise ValueError(
                 f"buddyinfo_lines do not contain required info: {buddyinfo_lines}"
             )
-
-    return [parse(line) for line in buddyinfo_lines]
+        d: Dict[str, str] = match_result.groupdict()
+        blocks = list(map(int, d["blocks"].split()))
+        yield d["node"], d["zone"], blocks[order:]
 
 
 def check_threshold(
@@ -2,14 +2,13 @@
 # All rights reserved.
 import logging
 import os
-import socket
 import sys
 from contextlib import ExitStack
 from typing import Callable, Collection, Optional, Tuple
 
 import click
 
-import gni_lib
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -83,7 +82,7 @@ def check_running_process(
     heterogeneous_cluster_v1: bool,
 ) -> None:
     """Check that the specified processes are running."""
-    node: str = socket.gethostname()
+    node: str = get_hostname()
 
     logger, _ = init_logger(
         logger_name=type,
@@ -94,11 +93,7 @@ def check_running_process(
     logger.info(
         f"check-process check-running-process: cluster: {cluster}, node: {node}, type: {type}, process: {process_name}"
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
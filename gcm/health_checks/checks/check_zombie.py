@@ -2,7 +2,6 @@
 # All rights reserved.
 import logging
 import os
-import socket
 import sys
 import textwrap
 from contextlib import ExitStack
@@ -10,8 +9,8 @@ from typing import Callable, Collection, Optional, Tuple
 
 import click
 
-import gni_lib
 from gcm.exporters import registry
+from gcm.health_checks.check_utils.node_info import get_gpu_node_id, get_hostname
 from gcm.health_checks.check_utils.output_context_manager import OutputContext
 from gcm.health_checks.check_utils.telem import TelemetryContext
 from gcm.health_checks.click import (
@@ -120,7 +119,7 @@ def check_zombie(
     elapsed: int,
 ) -> None:
     """Check to make sure no zombie processes are running on the system."""
-    node: str = socket.gethostname()
+    node: str = get_hostname()
 
     logger, _ = init_logger(
         logger_name=type,
@@ -131,11 +130,7 @@ def check_zombie(
     logger.info(
         f"check-process check-zombie: cluster: {cluster}, node: {node}, type: {type}"
     )
-    try:
-        gpu_node_id = gni_lib.get_gpu_node_id()
-    except Exception as e:
-        gpu_node_id = None
-        logger.warning(f"Could not get gpu_node_id, likely not a GPU host: {e}")
+    gpu_node_id = get_gpu_node_id(logger)
 
     derived_cluster = get_derived_cluster(
         cluster=cluster,
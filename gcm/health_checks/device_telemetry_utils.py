@@ -1,11 +1,18 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # All rights reserved.
 import os
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
 
 from gcm.health_checks.types import CHECK_TYPE
 
-from gcm.monitoring.device_telemetry_client import DeviceTelemetryClient
+from gcm.monitoring.device_telemetry_client import (
+    DeviceTelemetryClient,
+    DeviceTelemetryException,
+    GPUDevice,
+)
+
+T = TypeVar("T")
 
 
 def get_gpu_devices(
@@ -23,3 +30,55 @@ def get_gpu_devices(
     else:
         device_count = device_telemetry.get_device_count()
         return list(range(device_count))
+
+
+class CachedDeviceTelemetryClient:
+    """Look up the device count and each device handle at most once.
+
+    Meant to be shared by the checks of a single invocation. Failed lookups are
+    not cached, so every check that needs them retries and reports the error.
+    """
+
+    def __init__(self, device_telemetry: DeviceTelemetryClient) -> None:
+        self._device_telemetry = device_telemetry
+        self._device_count: Optional[int] = None
+        self._devices: Dict[int, GPUDevice] = {}
+
+    def get_device_count(self) -> int:
+        if self._device_count is None:
+            self._device_count = self._device_telemetry.get_device_count()
+        return self._device_count
+
+    def get_device_by_index(self, index: int) -> GPUDevice:
+        device = self._devices.get(index)
+        if device is None:
+            device = self._device_telemetry.get_device_by_index(index)
+            self._devices[index] = device
+        return device
+
+
+def query_devices(
+    device_telemetry: DeviceTelemetryClient,
+    devices: Iterable[int],
+    query: Callable[[GPUDevice], T],
+) -> List[Tuple[int, Union[T, DeviceTelemetryException]]]:
+    """Run `query` on each of the given GPU devices concurrently.
+
+    Returns `(device, result)` pairs in the order of `devices`, where the result is
+    the DeviceTelemetryException raised for that device if the query failed.
+    NVML calls release the GIL, so the per device round trips overlap.
+    """
+
+    def query_device(
+        device: int,
+    ) -> Tuple[int, Union[T, DeviceTelemetryException]]:
+        try:
+            return device, query(device_telemetry.get_device_by_index(device))
+        except DeviceTelemetryException as e:
+            return device, e
+
+    devices = list(devices)
+    if len(devices) <= 1:
+        return [query_device(device) for device in devices]
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        return list(executor.map(query_device, devices))
@@ -1,8 +1,13 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # All rights reserved.
+import os
+import signal
 import subprocess
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Protocol
+from typing import Deque, Dict, List, Optional, Protocol, Sequence, Union
 
 
 class ShellCommandOut(Protocol):
@@ -71,19 +76,24 @@ def piped_shell_command(cmd: List[str], timeout_secs: int) -> PipedShellCommandO
 
 
 def shell_command(
-    cmd: str,
+    cmd: Union[str, Sequence[str]],
     timeout_secs: Optional[int] = None,
     input: Optional[str] = None,
 ) -> subprocess.CompletedProcess:
     """
-    Run a command in shell and return the output as a string.
+    Run a command and return the output as a string.
+
+    A string command is run through the shell. A sequence of arguments is executed
+    directly, without spawning a shell; a missing executable is reported with the
+    shell's "command not found" exit code 127.
 
     Optionally pass an input string to the command's stdin pipe.
     """
+    shell = isinstance(cmd, str)
     try:
         return subprocess.run(
             cmd,
-            shell=True,
+            shell=shell,
             encoding="utf-8",
             input=input,
             stdout=subprocess.PIPE,
@@ -92,3 +102,109 @@ def shell_command(
         )
     except subprocess.TimeoutExpired as e:
         raise subprocess.TimeoutExpired(e.cmd, e.timeout, e.output, e.stderr)
+    except FileNotFoundError:
+        if shell:
+            raise
+        return subprocess.CompletedProcess(
+            args=list(cmd),
+            returncode=127,
+            stdout=f"{cmd[0]}: command not found\n",
+        )
+
+
+def _kill_process_group(pgid: int) -> None:
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def shell_command_tail(
+    cmd: Sequence[str],
+    timeout_secs: Optional[int] = None,
+    max_lines: int = 512,
+    keep_line_with: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command without a shell, keeping only the last `max_lines` lines of output.
+
+    Output is read as it is produced, so memory stays bounded for long running,
+    verbose commands. If `keep_line_with` is given, the last line containing it is
+    recorded as it goes by and put in front of the tail if it fell out of it.
+    A missing executable is reported like in `shell_command`.
+    The command runs in its own session. If it runs longer than `timeout_secs`, the
+    whole process group is killed (so children holding stdout open don't keep the
+    read blocked) and `subprocess.TimeoutExpired` is raised. The process group is
+    also killed if reading the output raises, e.g. on KeyboardInterrupt.
+    """
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            start_new_session=True,
+        )
+    except FileNotFoundError:
+        return subprocess.CompletedProcess(
+            args=list(cmd),
+            returncode=127,
+            stdout=f"{cmd[0]}: command not found\n",
+        )
+
+    lock = threading.Lock()
+    reading = True
+    timed_out = False
+
+    def kill_on_timeout() -> None:
+        nonlocal timed_out
+        # once the output is fully read the command is past the point where the
+        # timer may kill it, so a late timer can't turn a finished run into a timeout
+        with lock:
+            if reading:
+                timed_out = True
+                _kill_process_group(process.pid)
+
+    lines: Deque[str] = deque(maxlen=max_lines)
+    kept_line: Optional[str] = None
+    kept_line_index = line_count = 0
+    with process:
+        timer = None
+        deadline: Optional[float] = None
+        if timeout_secs is not None:
+            deadline = time.monotonic() + timeout_secs
+            timer = threading.Timer(timeout_secs, kill_on_timeout)
+            timer.start()
+        try:
+            assert process.stdout is not None
+            for line in process.stdout:
+                if keep_line_with is not None and keep_line_with in line:
+                    kept_line, kept_line_index = line, line_count
+                lines.append(line)
+                line_count += 1
+            with lock:
+                reading = False
+            if timed_out or deadline is None:
+                returncode = process.wait()
+            else:
+                try:
+                    returncode = process.wait(max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                    _kill_process_group(process.pid)
+                    returncode = process.wait()
+        except BaseException:
+            # the command doesn't get the signals sent to our process group, so
+            # don't leave it running when reading its output fails or is interrupted
+            _kill_process_group(process.pid)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    output = "".join(lines)
+    if kept_line is not None and line_count - kept_line_index > max_lines:
+        output = kept_line + output
+    if timed_out:
+        raise subprocess.TimeoutExpired(list(cmd), timeout_secs or 0, output)
+    return subprocess.CompletedProcess(list(cmd), returncode, output)
@@ -30,20 +30,21 @@ class ExitCode(Enum):
     UNKNOWN = 3  # Unknown will have a lower precedance than the rest of the ExitCodes for comparison purposes.
 
     def __eq__(self, other: object) -> bool:
-        return isinstance(other, ExitCode) and self.value == other.value
+        # members are singletons, so identity is value equality
+        return self is other
 
     def __le__(self, other: object) -> bool:
-        if self == ExitCode.UNKNOWN:
+        if self is ExitCode.UNKNOWN:
             return True
-        elif isinstance(other, ExitCode) and other == ExitCode.UNKNOWN:
+        elif other is ExitCode.UNKNOWN:
             return False
         else:
             return isinstance(other, ExitCode) and self.value <= other.value
 
     def __ge__(self, other: object) -> bool:
-        if self == ExitCode.UNKNOWN:
+        if self is ExitCode.UNKNOWN:
             return False
-        elif isinstance(other, ExitCode) and other == ExitCode.UNKNOWN:
+        elif other is ExitCode.UNKNOWN:
             return True
         else:
             return isinstance(other, ExitCode) and self.value >= other.value
@@ -53,17 +54,17 @@ class ExitCode(Enum):
         return hash(self.value)
 
     def __lt__(self, other: object) -> bool:
-        if self == ExitCode.UNKNOWN:
+        if self is ExitCode.UNKNOWN:
             return True
-        elif isinstance(other, ExitCode) and other == ExitCode.UNKNOWN:
+        elif other is ExitCode.UNKNOWN:
             return False
         else:
             return isinstance(other, ExitCode) and self.value < other.value
 
     def __gt__(self, other: object) -> bool:
-        if self == ExitCode.UNKNOWN:
+        if self is ExitCode.UNKNOWN:
             return False
-        elif isinstance(other, ExitCode) and other == ExitCode.UNKNOWN:
+        elif other is ExitCode.UNKNOWN:
             return True
         else:
             return isinstance(other, ExitCode) and self.value > other.value
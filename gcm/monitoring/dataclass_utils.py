@@ -1,5 +1,6 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # All rights reserved.
+import functools
 import logging
 
 from dataclasses import fields, is_dataclass
@@ -17,6 +18,8 @@ BaseType = int | float | str | bool
 NonFlattened = object
 FlattenedOrBaseType = dict[str, BaseType] | BaseType
 Flattened = dict[str, BaseType]
+# exact types of the leaves, which make up most of a telemetry tree
+_LEAF_TYPES = frozenset({str, int, float, bool})
 
 
 def instantiate_dataclass(
@@ -39,44 +42,48 @@ def instantiate_dataclass(
 
 
 def asdict_recursive(obj: NonFlattened, key: str = "") -> FlattenedOrBaseType:
+    if isinstance(obj, (str, int, float, bool)):
+        return obj
+    results: Flattened = {}
+    _flatten_into(obj, key, results)
+    return results
+
+
+@functools.lru_cache(maxsize=None)
+def _flattened_field_names(cls: type) -> tuple[str, ...]:
+    """Fields of the dataclass `cls` to flatten, i.e. all but `name`."""
+    return tuple(field.name for field in fields(cls) if field.name != "name")
+
+
+def _flatten_into(obj: NonFlattened, key: str, results: Flattened) -> None:
     # somewhat inspired by _asdict_inner https://github.com/python/cpython/blob/3.13/Lib/dataclasses.py#L1362
-    results = {}
-    if is_dataclass(obj):
+    # every level writes into the caller's `results`, so no intermediate dicts are
+    # built and merged on the way back up
+    if type(obj) in _LEAF_TYPES:
+        results[key] = cast(BaseType, obj)
+    elif is_dataclass(obj):
         if hasattr(obj, "name") and (name := getattr(obj, "name")):
             key += "." + name
-        for field in fields(obj):
-            if field.name == "name":
-                continue
-            value = getattr(obj, field.name)
+        for field_name in _flattened_field_names(
+            obj if isinstance(obj, type) else type(obj)
+        ):
+            value = getattr(obj, field_name)
             if value is None:
                 continue
-            flat_result = asdict_recursive(value, key)
-            if isinstance(flat_result, dict):
-                results.update(flat_result)
-            else:
-                results[key] = flat_result
+            _flatten_into(value, key, results)
     elif isinstance(obj, BaseModel):
         dumped_value = obj.model_dump(exclude={"name"})
         if hasattr(obj, "name") and (name := getattr(obj, "name")):
             key += "." + name
-        flat_result = asdict_recursive(dumped_value, key)
-        if isinstance(flat_result, dict):
-            results.update(flat_result)
-        else:
-            results[key] = flat_result
+        _flatten_into(dumped_value, key, results)
     elif isinstance(obj, dict):
         if "name" in obj:
             key += "." + str(obj["name"])
-            del obj["name"]
         for k, value in obj.items():
-            if value is None:
+            if value is None or k == "name":
                 continue
             new_key = f"{key}.{k}" if key else str(k)
-            flat_result = asdict_recursive(value, new_key)
-            if isinstance(flat_result, dict):
-                results.update(flat_result)
-            else:
-                results[new_key] = flat_result
+            _flatten_into(value, new_key, results)
     elif isinstance(obj, list) or isinstance(obj, tuple):
         for i, value in enumerate(obj):
             if value is None:
@@ -85,16 +92,11 @@ def asdict_recursive(obj: NonFlattened, key: str = "") -> FlattenedOrBaseType:
                 new_key = key
             else:
                 new_key = key + f".{i}"
-            flat_result = asdict_recursive(value, new_key)
-            if isinstance(flat_result, dict):
-                results.update(flat_result)
-            else:
-                results[new_key] = flat_result
+            _flatten_into(value, new_key, results)
     elif isinstance(obj, (str, int, float, bool)):
-        return obj
+        results[key] = obj
     else:
         raise TypeError(f"{type(obj)} is not supported for asdict_recursive.")
-    return results
 
 
 def flatten_dict_factory(pairs: list[tuple[str, object | BaseModel]]) -> Flattened:
@@ -132,15 +134,11 @@ def flatten_dict_factory(pairs: list[tuple[str, object | BaseModel]]) -> Flatten
             becomes:
             {"obj1.TestModelName.test_obj" = 123}
     """
-    results = {}
+    results: Flattened = {}
     for key, value in pairs:
         if value is None:
             continue
-        flat_result = asdict_recursive(value, key)
-        if isinstance(flat_result, dict):
-            results.update(flat_result)
-        else:
-            results[key] = flat_result
+        _flatten_into(value, key, results)
     return results
 
 
@@ -2,8 +2,10 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # All rights reserved.
 """Utility functions for the various monitors."""
+
 from __future__ import annotations
 
+import functools
 import inspect
 import logging
 import logging.handlers
@@ -74,6 +76,23 @@ def init_logger(
     return logger, handler
 
 
+@functools.lru_cache(maxsize=None)
+def init_logger_once(
+    logger_name: str, log_dir: str, log_name: str, log_level: int = logging.INFO
+) -> Tuple[logging.Logger, logging.Handler]:
+    """Set up logging like `init_logger`, at most once per set of arguments.
+
+    Repeated calls from a long-lived process reuse the logger and its open file
+    handler instead of attaching another handler on every call.
+    """
+    return init_logger(
+        logger_name=logger_name,
+        log_dir=log_dir,
+        log_name=log_name,
+        log_level=log_level,
+    )
+
+
 def run_data_collection_loop(
     logger_name: str,
     log_folder: str,
@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class ApplicationClockInfo:
     graphics_freq: int
     memory_freq: int
@@ -10,7 +10,12 @@ from typing import Any, Dict, List, Optional, Tuple
 import pytest
 from click.testing import CliRunner
 
-from gcm.health_checks.checks.check_iblink import check_iblink, IBLinkIssue, IBLinkState
+from gcm.health_checks.checks.check_iblink import (
+    check_iblink,
+    IBLinkCheckImpl,
+    IBLinkIssue,
+    IBLinkState,
+)
 from gcm.health_checks.checks.check_pci import PciDevice
 from gcm.health_checks.types import ExitCode
 from gcm.tests.data import health_checks
@@ -201,3 +206,17 @@ def test_iblinkissue_enum() -> None:
             last_criterion = value.value
             continue
         assert value.value > last_criterion
+
+
+def test_read_manifest_cached_until_file_changes(tmp_path: Path) -> None:
+    manifest_file = tmp_path / "manifest.json"
+    manifest_file.write_text(json.dumps({"ib": {"link_rate": "200 Gb/sec"}}))
+    impl = IBLinkCheckImpl("test cluster", "prolog", "INFO", str(tmp_path))
+
+    first = impl.read_manifest(str(manifest_file))
+    assert impl.read_manifest(str(manifest_file)) is first
+
+    manifest_file.write_text(json.dumps({"ib": {"link_rate": "400 Gb/sec (4X NDR)"}}))
+    assert impl.read_manifest(str(manifest_file)) == {
+        "ib": {"link_rate": "400 Gb/sec (4X NDR)"}
+    }
@@ -8,7 +8,11 @@ from typing import Tuple
 import pytest
 from click.testing import CliRunner
 
-from gcm.health_checks.checks.check_ibstat import check_ib_interfaces, check_ibstat
+from gcm.health_checks.checks.check_ibstat import (
+    check_ib_interfaces,
+    check_ibstat,
+    IBStatImpl,
+)
 from gcm.health_checks.subprocess import PipedShellCommandOut, ShellCommandOut
 from gcm.health_checks.types import ExitCode
 from gcm.tests.fakes import FakeShellCommandOut
@@ -27,7 +31,6 @@ class FakeIBStatImpl:
         self,
         use_physical_state: bool,
         iblinks_only: bool,
-        timeout_secs: int,
         logger: logging.Logger,
     ) -> PipedShellCommandOut:
         return self.ib_status
@@ -82,14 +85,14 @@ critical_ibstat_physical_state = PipedShellCommandOut(
             error_ibstat_physical_state,
             (
                 ExitCode.WARN,
-                "ibstat command FAILED to execute. error_code: 1 output: Error",
+                "Reading the port states from /sys/class/infiniband FAILED. error_code: 1 output: Error",
             ),
         ),
         (
             empty_ibstat_physical_state,
             (
                 ExitCode.WARN,
-                "ibstat command FAILED to execute. error_code: 0 output: ",
+                "Reading the port states from /sys/class/infiniband FAILED. error_code: 0 output: ",
             ),
         ),
         (
@@ -155,14 +158,14 @@ critical_ibstat_physical_state = PipedShellCommandOut(
             error_ibstat_physical_state,
             (
                 ExitCode.WARN,
-                "ibstat command FAILED to execute. error_code: 1 output: Error",
+                "Reading the port states from /sys/class/infiniband FAILED. error_code: 1 output: Error",
             ),
         ),
         (
             empty_ibstat_physical_state,
             (
                 ExitCode.WARN,
-                "ibstat command FAILED to execute. error_code: 0 output: ",
+                "Reading the port states from /sys/class/infiniband FAILED. error_code: 0 output: ",
             ),
         ),
         (
@@ -267,3 +270,43 @@ def test_ib_interfaces_state(
 
     assert result.exit_code == expected[0].value
     assert expected[1] in caplog.text
+
+
+def write_ib_port(
+    sysfs_path: Path, device: str, state: str, phys_state: str, link_layer: str
+) -> None:
+    port_path = sysfs_path / device / "ports" / "1"
+    port_path.mkdir(parents=True)
+    (port_path / "state").write_text(state + "\n")
+    (port_path / "phys_state").write_text(phys_state + "\n")
+    (port_path / "link_layer").write_text(link_layer + "\n")
+
+
+@pytest.mark.parametrize(
+    "use_physical_state, iblinks_only, expected",
+    [
+        (True, True, "Physical state: LinkUp"),
+        (False, True, "State: Active"),
+        (True, False, "Physical state: LinkUp\nPhysical state: Disabled"),
+        (False, False, "State: Active\nState: Down"),
+    ],
+)
+def test_get_ibstat_from_sysfs(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    use_physical_state: bool,
+    iblinks_only: bool,
+    expected: str,
+) -> None:
+    write_ib_port(tmp_path, "mlx5_0", "4: ACTIVE", "5: LinkUp", "InfiniBand")
+    write_ib_port(tmp_path, "mlx5_1", "1: DOWN", "3: Disabled", "Ethernet")
+    monkeypatch.setattr(
+        "gcm.health_checks.checks.check_ibstat.IB_SYSFS_CLASS_PATH", str(tmp_path)
+    )
+    impl = IBStatImpl("test cluster", "prolog", "INFO", str(tmp_path))
+
+    ibstat_output = impl.get_ibstat(
+        use_physical_state, iblinks_only, logging.getLogger(__name__)
+    )
+
+    assert ibstat_output == PipedShellCommandOut([0], expected)
@@ -8,7 +8,11 @@ from typing import Tuple
 import pytest
 from click.testing import CliRunner
 
-from gcm.health_checks.checks.check_ipmitool import check_ipmitool
+from gcm.health_checks.checks.check_ipmitool import (
+    check_ipmitool,
+    count_lines,
+    process_sel_lines,
+)
 from gcm.health_checks.subprocess import ShellCommandOut
 from gcm.health_checks.types import ExitCode
 from gcm.tests.fakes import FakeShellCommandOut
@@ -33,7 +37,7 @@ class FakeIpmitoolCheckImpl:
         return self.sel_out
 
     def clear_sel(
-        self, timeout_secs: int, output: str, clear_log_threshold: int
+        self, timeout_secs: int, line_count: int, clear_log_threshold: int
     ) -> None:
         pass
 
@@ -126,7 +130,7 @@ def test_clear_sel(
             return pass_sel
 
         def clear_sel(
-            self, timeout_secs: int, output: str, clear_log_threshold: int
+            self, timeout_secs: int, line_count: int, clear_log_threshold: int
         ) -> None:
             raise Exception
 
@@ -140,3 +144,20 @@ def test_clear_sel(
     )
 
     assert result.exit_code == ExitCode.WARN.value
+
+
+def test_process_sel_lines_from_stream() -> None:
+    lines = iter(fail_sel.stdout.splitlines())
+
+    assert process_sel_lines(lines) == (
+        ExitCode.CRITICAL,
+        "Detected error: Critical Interrupt #0x90, Bus Fatal Error",
+    )
+
+
+@pytest.mark.parametrize(
+    "output",
+    ["", "\n", "one line", "one line\n", "two\nlines", "two\nlines\n"],
+)
+def test_count_lines(output: str) -> None:
+    assert count_lines(output) == len(output.splitlines())
@@ -1,7 +1,6 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # All rights reserved.
 import logging
-import re
 import socket
 import subprocess
 from pathlib import Path
@@ -11,7 +10,12 @@ import pytest
 from click import BadParameter
 from click.testing import CliRunner
 
-from gcm.health_checks.checks.check_nccl import check_nccl, Flavor, get_hosts
+from gcm.health_checks.checks.check_nccl import (
+    check_nccl,
+    Flavor,
+    get_hosts,
+    split_opts,
+)
 from gcm.health_checks.subprocess import ShellCommandOut
 from gcm.health_checks.types import ExitCode
 from gcm.tests.fakes import FakeShellCommandOut
@@ -131,7 +135,7 @@ def test_check_nccl_successful(
 ) -> None:
     runner = CliRunner(mix_stderr=False)
 
-    def mock_shell_command(cmd: str, logger: logging.Logger) -> ShellCommandOut:
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
         return FakeShellCommandOut(
             [],
             0,
@@ -154,7 +158,7 @@ def test_check_nccl_successful(
 def test_check_nccl_failure(tmp_path: Path) -> None:
     runner = CliRunner(mix_stderr=False)
 
-    def mock_shell_command(cmd: str, logger: logging.Logger) -> ShellCommandOut:
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
         return FakeShellCommandOut([], 0, sample_failure_output)
 
     args = f"fair_cluster prolog --log-folder={tmp_path} --sink=do_nothing -p all_reduce --nccl-tdir /opt/nccl-tests/build/ --critical-threshold 200"
@@ -168,7 +172,7 @@ def test_check_nccl_failure(tmp_path: Path) -> None:
 
 
 def test_nccl_exception(caplog: pytest.LogCaptureFixture, tmp_path: Path) -> None:
-    def mock_shell_command(cmd: str, timeout: int) -> ShellCommandOut:
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
         raise subprocess.CalledProcessError(
             255,
             "",
@@ -295,12 +299,9 @@ def test_pairwise_nccl(
 ) -> None:
     runner = CliRunner(mix_stderr=False)
 
-    def mock_shell_command(cmd: str, logger: logging.Logger) -> ShellCommandOut:
-        host_arg = re.search("--host (.*?)(?:$|\\s)", cmd)
-
-        host1, host2 = None, None
-        if host_arg is not None:
-            host1, host2 = [arg.split(":")[0] for arg in host_arg.group(1).split(",")]
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
+        host_arg = cmd[cmd.index("--host") + 1]
+        host1, host2 = [arg.split(":")[0] for arg in host_arg.split(",")]
 
         return FakeShellCommandOut(
             [],
@@ -328,3 +329,149 @@ def test_pairwise_nccl(
         )
 
     assert result.exit_code == ExitCode.OK.value
+
+
+def test_single_nccl_multiple_hosts(
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: Path,
+) -> None:
+    runner = CliRunner(mix_stderr=False)
+
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
+        host_arg = cmd[cmd.index("--host") + 1]
+        return FakeShellCommandOut(
+            [],
+            0,
+            sample_single_success_output.format(hostname=host_arg.split(":")[0]),
+        )
+
+    args = f"fair_cluster prolog --log-folder={tmp_path} --sink=do_nothing -p all_reduce -p all_gather --single --hostlist fairwus3-1-htc-[100-103] --nccl-tdir /opt/nccl-tests/build/ --critical-threshold 200"
+
+    result = runner.invoke(
+        check_nccl,
+        args,
+        obj=mock_shell_command,
+    )
+
+    log_output_messages = [
+        message for message in caplog.messages if "Output:\n" in message
+    ]
+    expected_hosts = [
+        host
+        for host in [f"fairwus3-1-htc-{i}" for i in range(100, 104)]
+        for _ in range(2)
+    ]
+    assert log_output_messages == [
+        "Output:\n" + sample_single_success_output.format(hostname=host)
+        for host in expected_hosts
+    ]
+    assert result.exit_code == ExitCode.OK.value
+
+
+def test_nccl_command_is_split_into_argv(tmp_path: Path) -> None:
+    runner = CliRunner(mix_stderr=False)
+    commands: List[List[str]] = []
+
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
+        commands.append(cmd)
+        return FakeShellCommandOut(
+            [],
+            0,
+            sample_single_success_output.format(hostname=socket.gethostname()),
+        )
+
+    args = f"fair_cluster prolog --log-folder={tmp_path} --sink=do_nothing -p all_reduce --nccl-tdir /opt/nccl-tests/build/ --critical-threshold 200"
+
+    result = runner.invoke(
+        check_nccl,
+        args,
+        obj=mock_shell_command,
+    )
+
+    assert result.exit_code == ExitCode.OK.value
+    assert commands == [
+        [
+            "mpirun",
+            "--host",
+            f"{socket.gethostname()}:8",
+            "--np",
+            "8",
+            "-mca",
+            "coll_hcoll_enable",
+            "0",
+            "--bind-to",
+            "numa",
+            "-x",
+            "NCCL_IB_PCI_RELAXED_ORDERING=1",
+            "-x",
+            "CUDA_DEVICE_ORDER=PCI_BUS_ID",
+            "-x",
+            "NCCL_SOCKET_IFNAME=eth0",
+            "-x",
+            "NCCL_DEBUG=WARN",
+            "-x",
+            "NCCL_P2P_DISABLE=1",
+            "-x",
+            "NCCL_SHM_DISABLE=1",
+            "/opt/nccl-tests/build/all_reduce_perf",
+            "-g",
+            "1",
+            "-b",
+            "32M",
+            "-e",
+            "1G",
+            "-f",
+            "2",
+        ]
+    ]
+
+
+def test_split_opts_expands_vars_and_home(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", "/home/user")
+    monkeypatch.setenv("GCM_TEST_PATH", "/usr/bin")
+
+    assert split_opts("-x PATH=/opt/x:$GCM_TEST_PATH --prefix ~/ompi 'a b'") == [
+        "-x",
+        "PATH=/opt/x:/usr/bin",
+        "--prefix",
+        "/home/user/ompi",
+        "a b",
+    ]
+
+
+@pytest.mark.parametrize(
+    "fail_fast, expected_runs",
+    [
+        ("--fail-fast", 1),
+        ("--no-fail-fast", 3),
+    ],
+)
+def test_pairwise_nccl_fail_fast(
+    tmp_path: Path,
+    fail_fast: str,
+    expected_runs: int,
+) -> None:
+    runner = CliRunner(mix_stderr=False)
+    commands: List[List[str]] = []
+
+    def mock_shell_command(cmd: List[str], timeout: int) -> ShellCommandOut:
+        commands.append(cmd)
+        host1, host2 = [
+            arg.split(":")[0] for arg in cmd[cmd.index("--host") + 1].split(",")
+        ]
+        return FakeShellCommandOut(
+            [],
+            0,
+            sample_pairwise_success_output.format(host1=host1, host2=host2),
+        )
+
+    args = f"fair_cluster prolog --log-folder={tmp_path} --sink=do_nothing -p all_reduce --pairwise --hostlist fairwus3-1-htc-[100-102] --nccl-tdir /opt/nccl-tests/build/ --critical-threshold 200 {fail_fast}"
+
+    result = runner.invoke(
+        check_nccl,
+        args,
+        obj=mock_shell_command,
+    )
+
+    assert len(commands) == expected_runs
+    assert result.exit_code == ExitCode.CRITICAL.value
@@ -8,7 +8,13 @@ from typing import Tuple
 import pytest
 from click.testing import CliRunner
 
-from gcm.health_checks.checks.check_node import check_dnf_repos, check_module, uptime
+from gcm.health_checks.checks.check_node import (
+    check_dnf_repos,
+    check_module,
+    count_lsmod_matches,
+    read_uptime_secs,
+    uptime,
+)
 from gcm.health_checks.subprocess import PipedShellCommandOut, ShellCommandOut
 from gcm.health_checks.types import ExitCode
 from gcm.tests.fakes import FakeShellCommandOut
@@ -220,3 +226,40 @@ def test_check_module_value_exception(
             obj=FakeNodeCheckImpl,
             catch_exceptions=False,
         )
+
+
+sample_proc_modules = """nvidia_uvm 1531904 0 - Live 0x0000000000000000 (POE)
+nvidia_drm 94208 0 - Live 0x0000000000000000 (POE)
+nvidia_modeset 1302528 1 nvidia_drm, Live 0x0000000000000000 (POE)
+nvidia 56672256 2 nvidia_uvm,nvidia_modeset, Live 0x0000000000000000 (POE)
+ib_core 434176 1 mlx5_ib, Live 0x0000000000000000
+mlx5_ib 446464 0 - Live 0x0000000000000000
+"""
+
+
+@pytest.mark.parametrize(
+    "module, expected",
+    [
+        ("nvidia", 4),
+        ("nvidia_uvm", 2),
+        ("mlx5_ib", 2),
+        ("ib_core", 1),
+        ("Live", 0),
+        ("not_loaded", 0),
+        ("^nvidia_", 3),
+        ("nvidia_(uvm|drm)", 4),
+        ("Used by", 1),
+    ],
+)
+def test_count_lsmod_matches(tmp_path: Path, module: str, expected: int) -> None:
+    proc_modules = tmp_path / "modules"
+    proc_modules.write_text(sample_proc_modules)
+
+    assert count_lsmod_matches(module, str(proc_modules)) == expected
+
+
+def test_read_uptime_secs(tmp_path: Path) -> None:
+    proc_uptime = tmp_path / "uptime"
+    proc_uptime.write_text("12000.57 95412.34\n")
+
+    assert read_uptime_secs(str(proc_uptime)) == "12000"
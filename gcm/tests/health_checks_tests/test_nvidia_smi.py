@@ -16,6 +16,10 @@ from gcm.health_checks.checks.check_nvidia_smi import (
     check_nvidia_smi,
     NvidiaSmiCli,
 )
+from gcm.health_checks.device_telemetry_utils import (
+    CachedDeviceTelemetryClient,
+    query_devices,
+)
 from gcm.health_checks.types import ExitCode
 
 from gcm.monitoring.device_telemetry_client import (
@@ -1167,3 +1171,58 @@ def test_vbios_mismatch(
         )
     assert result.exit_code == expected[0].value
     assert expected[1] in caplog.text
+
+
+def test_cached_device_telemetry_client() -> None:
+    @dataclass
+    class CountingDeviceTelemetryClient:
+        device: GPUDevice = field(default_factory=FakeGPUDevice)
+        count_calls: int = 0
+        index_calls: List[int] = field(default_factory=list)
+        fail: bool = True
+
+        def get_device_count(self) -> int:
+            self.count_calls += 1
+            return 2
+
+        def get_device_by_index(self, index: int) -> GPUDevice:
+            self.index_calls.append(index)
+            if index == 1 and self.fail:
+                self.fail = False
+                raise DeviceTelemetryException()
+            return self.device
+
+    client = CountingDeviceTelemetryClient()
+    cached = CachedDeviceTelemetryClient(client)
+
+    assert cached.get_device_count() == cached.get_device_count() == 2
+    assert cached.get_device_by_index(0) is cached.get_device_by_index(0)
+    with pytest.raises(DeviceTelemetryException):
+        cached.get_device_by_index(1)
+    cached.get_device_by_index(1)
+    cached.get_device_by_index(1)
+
+    assert client.count_calls == 1
+    assert client.index_calls == [0, 1, 1]
+
+
+def test_query_devices_keeps_order_and_captures_errors() -> None:
+    @dataclass
+    class FlakyDeviceTelemetryClient:
+        device: GPUDevice = field(default_factory=FakeGPUDevice)
+
+        def get_device_count(self) -> int:
+            return 3
+
+        def get_device_by_index(self, index: int) -> GPUDevice:
+            if index == 1:
+                raise DeviceTelemetryException()
+            return self.device
+
+    results = query_devices(
+        FlakyDeviceTelemetryClient(), range(3), lambda gpu: gpu.get_vbios_version()
+    )
+
+    assert [device for device, _ in results] == [0, 1, 2]
+    assert isinstance(results[1][1], DeviceTelemetryException)
+    assert results[0][1] == results[2][1] == FakeGPUDevice().get_vbios_version()
@@ -0,0 +1,60 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+import subprocess
+import sys
+import time
+
+import pytest
+
+from gcm.health_checks.subprocess import shell_command_tail
+
+
+def test_shell_command_tail_keeps_last_lines() -> None:
+    result = shell_command_tail(
+        [sys.executable, "-c", "for i in range(100): print(i)"], 10, max_lines=3
+    )
+
+    assert result.returncode == 0
+    assert result.stdout == "97\n98\n99\n"
+
+
+def test_shell_command_tail_missing_binary() -> None:
+    result = shell_command_tail(["gcm-no-such-binary"], 10)
+
+    assert result.returncode == 127
+    assert result.stdout == "gcm-no-such-binary: command not found\n"
+
+
+def test_shell_command_tail_timeout() -> None:
+    with pytest.raises(subprocess.TimeoutExpired):
+        shell_command_tail([sys.executable, "-c", "import time; time.sleep(30)"], 1)
+
+
+def test_shell_command_tail_keeps_matching_line() -> None:
+    result = shell_command_tail(
+        [
+            sys.executable,
+            "-c",
+            "print('Avg bus bandwidth : 1.5')\nfor i in range(10): print(i)",
+        ],
+        10,
+        max_lines=3,
+        keep_line_with="Avg bus bandwidth",
+    )
+
+    assert result.returncode == 0
+    assert result.stdout == "Avg bus bandwidth : 1.5\n7\n8\n9\n"
+
+
+def test_shell_command_tail_timeout_kills_children() -> None:
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        shell_command_tail(["sh", "-c", "sleep 30 & sleep 30"], 1)
+    assert time.monotonic() - start < 10
+
+
+def test_shell_command_tail_kills_children_when_reading_fails() -> None:
+    start = time.monotonic()
+    with pytest.raises(UnicodeDecodeError):
+        shell_command_tail(["sh", "-c", "sleep 30 & printf '\\377\\n'; sleep 30"], 60)
+    assert time.monotonic() - start < 10
@@ -7,7 +7,12 @@ from typing import Dict, Optional, TYPE_CHECKING
 
 import pytest
 
-from gcm.monitoring.dataclass_utils import flatten_dict_factory, Flattened, max_fields
+from gcm.monitoring.dataclass_utils import (
+    asdict_recursive,
+    flatten_dict_factory,
+    Flattened,
+    max_fields,
+)
 from gcm.monitoring.meta_utils.scuba import ScubaMessage, to_scuba_message
 from pydantic import BaseModel
 from typeguard import typechecked
@@ -457,3 +462,12 @@ class TestNestedDictList:
 def test_asdict_recursive(data: DataclassInstance, expected: Flattened) -> None:
     actual = asdict(data, dict_factory=flatten_dict_factory)
     assert actual == expected
+
+
+def test_asdict_recursive_does_not_mutate_input() -> None:
+    data = {"name": "gpu0", "temp": 40, "nested": {"name": "mem", "used": 1}}
+
+    actual = asdict_recursive(data, "host")
+
+    assert actual == {"host.gpu0.temp": 40, "host.gpu0.nested.mem.used": 1}
+    assert data == {"name": "gpu0", "temp": 40, "nested": {"name": "mem", "used": 1}}
@@ -3,7 +3,7 @@
 import logging
 import os
 import sys
-from typing import Callable, Dict, final, Iterable, Optional
+from typing import Callable, cast, Dict, final, Iterable, List, Optional
 from unittest.mock import MagicMock
 
 import click
@@ -11,7 +11,7 @@ import pytest
 from click import Path
 from click.testing import CliRunner
 from gcm.exporters.graph_api import GraphAPI
-from gcm.health_checks.check_utils.telem import TelemetryContext
+from gcm.health_checks.check_utils.telem import TelemetryBatch, TelemetryContext
 from gcm.health_checks.types import ExitCode
 from gcm.monitoring.meta_utils.scribe import ScribeConfig, write_messages
 from gcm.monitoring.meta_utils.scuba import ScubaMessage
@@ -120,3 +120,47 @@ def test_telemetry_exception_not_affecting_check_output(
 
     assert result.exit_code == 0
     assert "Telemetry failed with exception" in caplog.text
+
+
+written_logs: List[Log] = []
+
+
+@fake_register("recording")
+@final
+class FakeRecordingSink(SinkImpl):
+    def write(self, data: Log, additional_params: SinkAdditionalParams) -> None:
+        written_logs.append(data)
+
+
+def test_telemetry_batch_writes_records_once() -> None:
+    logger = logging.getLogger(__name__)
+    written_logs.clear()
+
+    with TelemetryBatch(
+        sink="recording", sink_opts=(), logger=logger, telem_registry=fake_registry
+    ) as batch:
+        for name in (HealthCheckName.NVIDIA_SMI_GPU_NUM, HealthCheckName.IPMI_SEL):
+            with TelemetryContext(
+                sink="recording",
+                sink_opts=(),
+                logger=logger,
+                cluster="fair_cluster",
+                derived_cluster="fair_cluster",
+                type="nagios",
+                name=name.value,
+                node="test_node",
+                get_exit_code_msg=lambda: (ExitCode.OK, "Success"),
+                gpu_node_id="abcd",
+                job_id=14,
+                telem_registry=fake_registry,
+                batch=batch,
+            ):
+                pass
+        assert written_logs == []
+
+    assert len(written_logs) == 1
+    records = cast(List[HealthCheckLog], written_logs[0].message)
+    assert [record.health_check for record in records] == [
+        HealthCheckName.NVIDIA_SMI_GPU_NUM.value,
+        HealthCheckName.IPMI_SEL.value,
+    ]